@@ -0,0 +1,169 @@
+import argparse
+import importlib
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+import geo
+from census import DATA_FILE, HIERARCHY, file_signature, ingest
+from charts import CHART_TYPES
+from dataset import Dataset
+from perf import finish_trace, start_trace
+from synthetic import write_boundaries, write_scaled_csv
+from views import FIXED_CHART_PAGES, PAGES
+
+BASELINE_FILE = Path(__file__).with_name("bench_baseline.json")
+
+# Bundled CSV and synthetic copies of it with the same provinces, divisions and districts
+SCALES = [1, 10, 100, 1000]
+
+
+def load_scaled(factor, data_dir):
+    # The bundled CSV, or a synthetic copy `factor` times its size (written once
+    # and reused by later runs)
+    if factor == 1:
+        path = DATA_FILE
+    else:
+        path = Path(data_dir) / f"census_x{factor}.csv"
+        if not path.exists():
+            write_scaled_csv(path, factor)
+    return Dataset.from_frame(str(path), file_signature(path), ingest(path))
+
+
+def use_boundaries(directory, data_dir):
+    # Point the map page at `directory`, or at placeholder boundaries for the
+    # bundled CSV's units (written once to `data_dir`), so it draws real figures
+    if directory is None:
+        directory = Path(data_dir) / "boundaries"
+        if not geo.boundary_path(HIERARCHY[0], directory).exists():
+            write_boundaries(directory, load_scaled(1, data_dir).rollups)
+    geo.BOUNDARY_DIR = Path(directory)
+
+
+def run_page(dataset, page, chart_type):
+    # Render one page headlessly and return its trace. Without a Streamlit
+    # runtime widgets return their defaults and st.cache_resource doesn't
+    # cache, so every figure is built and serialized as on a cache miss
+    module = importlib.import_module(f"views.{PAGES[page]}")
+    trace = start_trace(page)
+    module.render(dataset, page, chart_type)
+    return finish_trace()
+
+
+def bench(scales=SCALES, repeat=3, data_dir=None):
+    rows = []
+    for factor in scales:
+        dataset = load_scaled(factor, data_dir)
+        for page in PAGES:
+            for chart_type in CHART_TYPES[:1] if page in FIXED_CHART_PAGES else CHART_TYPES:
+                run_page(dataset, page, chart_type)  # warm up imports
+                # Calibration runs between the page's runs, so both see the same load
+                traces, calibrations = [], []
+                for _ in range(repeat):
+                    traces.append(run_page(dataset, page, chart_type))
+                    calibrations.append(calibrate())
+                total = statistics.median(t.total for t in traces)
+                build = statistics.median(t.seconds["build"] for t in traces)
+                serialize = statistics.median(t.seconds["serialize"] for t in traces)
+                rows.append({
+                    "scale": factor,
+                    "rows": len(dataset.frame),
+                    "page": page,
+                    "chart_type": chart_type,
+                    "figures": traces[0].counts["figure cache miss"],
+                    "compute_ms": round(1000 * (total - build - serialize), 2),
+                    "build_ms": round(1000 * build, 2),
+                    "serialize_ms": round(1000 * serialize, 2),
+                    "payload_bytes": traces[0].counts["payload bytes"],
+                    "calibration_ms": round(statistics.median(calibrations), 2),
+                })
+                print(f"{factor:>5}x  {page:45s} {chart_type:18s} {1000 * total:8.1f} ms", file=sys.stderr)
+    return rows
+
+
+def calibrate(repeat=3):
+    # Milliseconds for a fixed figure build and serialization, the kind of
+    # work the pages are timed on. Baseline timings are scaled by the ratio
+    # of this run's calibration to the baseline's, so a slower or busier
+    # machine doesn't read as a regression
+    df = pd.DataFrame({"unit": [f"Unit {i}" for i in range(40)], "value": np.arange(40.0)})
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        px.bar(df, x="unit", y="value").to_json()
+        times.append(time.perf_counter() - started)
+    return round(1000 * statistics.median(times), 2)
+
+
+def compare(rows, baseline, tolerance=0.5, min_ms=5.0):
+    # Payloads that grew (deterministic, so always a regression) and timings
+    # more than `tolerance` slower than the calibrated baseline, ignoring
+    # differences under `min_ms`
+    previous = {(b["scale"], b["page"], b["chart_type"]): b for b in baseline}
+    for row in rows:
+        base = previous.get((row["scale"], row["page"], row["chart_type"]))
+        row["regressions"], row["slower"] = "", ""
+        if base is None:
+            continue
+        if row["payload_bytes"] > base["payload_bytes"]:
+            row["regressions"] = f"payload_bytes {base['payload_bytes']:,} -> {row['payload_bytes']:,}"
+        speed = row["calibration_ms"] / base["calibration_ms"]
+        slower = []
+        for field in ["compute_ms", "build_ms", "serialize_ms"]:
+            expected = base[field] * speed
+            if row[field] > expected * (1 + tolerance) and row[field] - expected > min_ms:
+                slower.append(f"{field} {expected:.1f} -> {row[field]:.1f}")
+        row["slower"] = "; ".join(slower)
+    return [row for row in rows if row["regressions"]], [row for row in rows if row["slower"]]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render every dashboard page headlessly at scaled data sizes.")
+    parser.add_argument("--scales", type=lambda s: [int(x) for x in s.split(",")], default=SCALES,
+                        help="comma-separated copies of the bundled CSV (default: 1,10,100,1000)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per page and chart type; the median is reported")
+    parser.add_argument("--data-dir", default=Path(tempfile.gettempdir()) / "census-bench",
+                        help="where synthetic CSVs are written and reused")
+    parser.add_argument("--boundaries", type=Path,
+                        help="boundary files for the map page (default: placeholder ones written to --data-dir)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown before a timing is flagged")
+    parser.add_argument("--strict-timings", action="store_true", help="also fail on flagged timings, not only on payloads")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    args = parser.parse_args()
+
+    # Bare-mode warnings ("No runtime found", ...) on every widget call
+    logging.disable(logging.WARNING)
+    Path(args.data_dir).mkdir(parents=True, exist_ok=True)
+    use_boundaries(args.boundaries, args.data_dir)
+
+    rows = bench(args.scales, args.repeat, args.data_dir)
+    regressions, slower = [], []
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(rows, ensure_ascii=False, indent=1))
+    elif args.baseline.exists():
+        regressions, slower = compare(rows, json.loads(args.baseline.read_text()), args.tolerance)
+    if args.json:
+        args.json.write_text(json.dumps(rows, ensure_ascii=False, indent=1))
+
+    with pd.option_context("display.width", 250, "display.max_rows", None, "display.max_colwidth", 60):
+        print(pd.DataFrame(rows).to_string(index=False))
+    if slower:
+        print(f"\n{len(slower)} timing(s) slower than the calibrated baseline:")
+        for row in slower:
+            print(f"  {row['scale']}x {row['page']} / {row['chart_type']}: {row['slower']}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+        for row in regressions:
+            print(f"  {row['scale']}x {row['page']} / {row['chart_type']}: {row['regressions']}")
+    if regressions or (slower and args.strict_timings):
+        sys.exit(1)
@@ -0,0 +1,195 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from metrics import DERIVED_SCHEMA, derive_metrics, households
+
+DATA_FILE = Path(__file__).with_name("sub-division_population_of_pakistan.csv")
+
+# Administrative hierarchy, coarsest level first
+HIERARCHY = ["PROVINCE", "DIVISION", "DISTRICT", "SUB DIVISION"]
+
+# Explicit column schema for the census extract (all 21 columns). Counts fit
+# comfortably in 32 bits at sub-division or village level; rollups widen them
+# before summing
+SCHEMA = {
+    "PROVINCE": "category",
+    "DIVISION": "category",
+    "DISTRICT": "category",
+    "SUB DIVISION": "object",  # leaf names are nearly all unique, so categories wouldn't save anything
+    "AREA (sq.km)": "float32",
+    "ALL SEXES (RURAL)": "int32",
+    "MALE (RURAL)": "int32",
+    "FEMALE (RURAL)": "int32",
+    "TRANSGENDER (RURAL)": "int32",
+    "SEX RATIO (RURAL)": "float32",
+    "AVG HOUSEHOLD SIZE (RURAL)": "float32",
+    "POPULATION 1998 (RURAL)": "int32",
+    "ANNUAL GROWTH RATE (RURAL)": "float32",
+    "ALL SEXES (URBAN)": "int32",
+    "MALE (URBAN)": "int32",
+    "FEMALE (URBAN)": "int32",
+    "TRANSGENDER (URBAN)": "int32",
+    "SEX RATIO (URBAN)": "float32",
+    "AVG HOUSEHOLD SIZE (URBAN)": "float32",
+    "POPULATION 1998 (URBAN)": "int32",
+    "ANNUAL GROWTH RATE (URBAN)": "float32",
+}
+
+NUMERIC_COLUMNS = [col for col in SCHEMA if col not in HIERARCHY]
+
+# Key under which the source file signature is stored in the snapshot metadata
+SNAPSHOT_KEY = b"census_source_signature"
+
+# Bump whenever SCHEMA or DERIVED_SCHEMA change so stale snapshots are rebuilt
+SNAPSHOT_FORMAT = 3
+
+
+def snapshot_path(path):
+    return Path(path).with_suffix(".parquet")
+
+
+def file_signature(path):
+    # Cheap change detector: modification time and size of the source file
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def sort_by_hierarchy(df, levels=HIERARCHY):
+    # Stable sort that keeps units in order of first appearance but makes every
+    # province, division and district a contiguous block of rows
+    keys = []
+    path = np.zeros(len(df), dtype="int64")
+    for level in levels:
+        # Code of the full path down to this level, numbered by first appearance
+        codes, names = pd.factorize(df[level], sort=False)
+        path = pd.factorize(path * (len(names) + 1) + codes, sort=False)[0]
+        keys.append(path)
+    order = np.lexsort(keys[::-1])
+    return df.iloc[order].reset_index(drop=True)
+
+
+def fits(values, dtype):
+    # Whether every value is representable in the (integer) dtype
+    if not dtype.startswith("int") or not len(values):
+        return True
+    info = np.iinfo(dtype)
+    return info.min <= values.min() and values.max() <= info.max
+
+
+def check_ranges(df):
+    # Refuse to silently wrap counts that don't fit the schema's integer types
+    for col, dtype in SCHEMA.items():
+        if not fits(df[col], dtype):
+            raise ValueError(f"{col} has values outside the {dtype} range")
+
+
+def derive(df):
+    # Derived metrics are computed once here and stored in the snapshot
+    return derive_metrics(households(df)).astype(DERIVED_SCHEMA)
+
+
+def compact(df):
+    # Narrow a table of per-unit values to the row schema wherever its values
+    # fit; counts that outgrow 32 bits keep their 64-bit type
+    dtypes = {**SCHEMA, **DERIVED_SCHEMA}
+    return df.astype({col: dtypes[col] for col in df if col in NUMERIC_COLUMNS + list(DERIVED_SCHEMA) and fits(df[col], dtypes[col])})
+
+
+def clean(raw):
+    # Coerce every column to its schema type and drop incomplete rows
+    df = raw.loc[:, list(SCHEMA)]
+    for col in NUMERIC_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    df = df.dropna()
+    check_ranges(df)
+    return derive(df.astype(SCHEMA))
+
+
+# Values such as "180,000" use a thousands separator
+CSV_OPTIONS = {"thousands": ",", "dtype": {col: str for col in HIERARCHY}}
+
+
+def read_csv(path):
+    return sort_by_hierarchy(clean(pd.read_csv(path, **CSV_OPTIONS)))
+
+
+def read_chunks(path, chunksize=100_000):
+    # Stream the CSV as cleaned, typed chunks without ever holding the whole
+    # file; rows keep their file order
+    with pd.read_csv(path, chunksize=chunksize, **CSV_OPTIONS) as reader:
+        for raw in reader:
+            yield clean(raw)
+
+
+def read_snapshot(path, signature):
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+        if metadata.get(SNAPSHOT_KEY) != f"{SNAPSHOT_FORMAT}:{signature}".encode():
+            return None
+        return pq.read_table(path).to_pandas()
+    except (OSError, ValueError):
+        return None
+
+
+def write_snapshot(df, path, signature):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SNAPSHOT_KEY] = f"{SNAPSHOT_FORMAT}:{signature}".encode()
+    table = table.replace_schema_metadata(metadata)
+
+    # Write to a temporary file first so readers never see a partial snapshot
+    tmp_path = Path(path).with_suffix(".parquet.tmp")
+    try:
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+    except OSError:
+        # A read-only checkout still works, it just re-parses the CSV
+        tmp_path.unlink(missing_ok=True)
+
+
+def ingest(path=DATA_FILE):
+    # Read the columnar snapshot if it matches the CSV, otherwise rebuild it
+    signature = file_signature(path)
+    snapshot = snapshot_path(path)
+    df = read_snapshot(snapshot, signature)
+    if df is None:
+        df = read_csv(path)
+        write_snapshot(df, snapshot, signature)
+    return df
+
+
+def freeze(df):
+    # Consolidated copy whose block arrays are read-only, so any in-place write
+    # (df.loc[...] = ...) on the frame or on a view of it raises instead of
+    # changing data shared between sessions
+    df = df.copy()
+    for values in df._mgr.arrays:
+        values = getattr(values, "_ndarray", values)  # categorical codes
+        values.flags.writeable = False
+    return df
+
+
+def shared(df):
+    # What callers get of a frozen frame: a shallow copy over the same
+    # read-only arrays. Assigning, adding or dropping columns only changes the
+    # copy, and in-place writes to values still raise
+    return df.copy(deep=False)
+
+
+def memory_report(path=DATA_FILE):
+    # Bytes per column as pandas loads the CSV by default versus the compact
+    # schema, including the derived columns stored alongside
+    before = pd.read_csv(path, thousands=",").memory_usage(deep=True, index=False)
+    after = ingest(path).memory_usage(deep=True, index=False)
+    report = pd.DataFrame({"before": before, "after": after}, index=after.index)
+    report.loc["TOTAL"] = report.sum()
+    return report.fillna(0).astype("int64")
+
+
+if __name__ == "__main__":
+    print(memory_report().to_string())
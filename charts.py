@@ -0,0 +1,186 @@
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from metrics import SUMMABLE_COLUMNS
+from perf import count, record_payload, span
+
+
+class FigureCache:
+    """Bounded LRU cache of built Plotly figures, shared by every session."""
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                count("figure cache hit")
+                record_payload(entry[0].layout.title.text, entry[1])
+                return entry[0]
+            self.misses += 1
+        count("figure cache miss")
+
+        # Build outside the lock so one slow figure doesn't block other sessions
+        with span("build"):
+            fig = build()
+        with span("serialize"):
+            size = len(fig.to_json())
+        record_payload(fig.layout.title.text, size)
+        self.put(key, fig, size)
+        return fig
+
+    def put(self, key, fig, size):
+        # Store a figure built elsewhere (e.g. loaded from prerendered snapshots)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (fig, size)
+                self.bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
+
+
+# Where prerender.py writes its snapshots; the app loads figures from here
+SNAPSHOT_DIR = Path(__file__).with_name("snapshots")
+
+
+def warm_figure_cache(cache, version, out_dir=SNAPSHOT_DIR, max_changed=0):
+    # Load prerendered figures of this dataset version into the figure cache:
+    # views with at most `max_changed` widgets off their default (by default,
+    # the view every page opens with), until the cache is full. Parsing costs
+    # about 10 ms per figure. Returns the number loaded
+    import plotly.io as pio
+
+    index_file = Path(out_dir) / "index.json"
+    if not index_file.exists():
+        return 0
+    index = json.loads(index_file.read_text(encoding="utf-8"))
+    if index["version"] != version:
+        return 0  # built from another version of the CSV
+
+    loaded = set()
+    for entry in sorted(index["snapshots"], key=lambda entry: entry["changed"]):
+        if len(loaded) >= cache.max_entries or entry["changed"] > max_changed:
+            break
+        if not entry["figures"]:
+            continue
+        snapshot = json.loads((Path(out_dir) / entry["json"]).read_text(encoding="utf-8"))
+        for element in snapshot["elements"]:
+            if element["type"] == "figure" and element["key"] is not None and tuple(element["key"]) not in loaded:
+                key = tuple(element["key"])
+                text = json.dumps(element["figure"])
+                cache.put(key, pio.from_json(text), len(text))
+                loaded.add(key)
+    return len(loaded)
+
+
+# Chart types build_chart understands; the sidebar offers the first two
+CHART_TYPES = ["📊 Bar Chart", "🥧 Pie Chart", "📈 Line Chart", "🔵 Scatter Chart"]
+
+# Charts with more items than this show the largest ones plus "Other"
+TOP_N = {"📊 Bar Chart": 40, "🥧 Pie Chart": 12}
+
+# Line and scatter charts with more points than this are drawn with WebGL
+WEBGL_THRESHOLD = 1000
+
+# Decimal places sent for non-integer values (rates, ratios, sizes)
+DISPLAY_DECIMALS = 2
+
+
+def render_mode(points):
+    return "webgl" if points > WEBGL_THRESHOLD else "svg"
+
+
+def chart_data(data, x_column, y_column, chart_type):
+    # Only the plotted columns, at display precision, with items beyond the
+    # top N folded into "Other". Returns the frame and a note for the title
+    values = data[y_column].to_numpy()
+    if values.dtype.kind == "f":
+        values = values.astype("float64").round(DISPLAY_DECIMALS)
+    frame = pd.DataFrame({x_column: data[x_column].to_numpy(), y_column: values})
+
+    top_n = TOP_N.get(chart_type)
+    if top_n is None or len(frame) <= top_n + 1:
+        return frame, ""
+    order = np.argsort(-values, kind="stable")
+    top = frame.iloc[np.sort(order[:top_n])]  # largest items, in source order
+    rest = order[top_n:]
+    if chart_type == "🥧 Pie Chart" or y_column in SUMMABLE_COLUMNS:
+        other = pd.DataFrame({x_column: [f"Other ({len(rest):,})"], y_column: [values[rest].sum()]})
+        return pd.concat([top, other], ignore_index=True), ""
+    # Averages and rates can't be summed into "Other": show the top N only
+    return top, f" (top {top_n} of {len(frame):,})"
+
+
+def build_chart(data, x_column, y_column, title, x_label, y_label, chart_type):
+    # Plotly Express loads with the first figure built, not with the app
+    import plotly.express as px
+
+    data, note = chart_data(data, x_column, y_column, chart_type)
+    title += note
+    if chart_type == "📊 Bar Chart":
+        fig = px.bar(data, x=x_column, y=y_column, title=title, labels={x_column: x_label, y_column: y_label},
+                     color_discrete_sequence=["#66BB6A"])  # Green
+    elif chart_type == "🥧 Pie Chart":
+        fig = px.pie(data, names=x_column, values=y_column, title=title,
+                     color_discrete_sequence=px.colors.qualitative.Set3)
+    elif chart_type == "📈 Line Chart":
+        fig = px.line(data, x=x_column, y=y_column, title=title, labels={x_column: x_label, y_column: y_label},
+                      color_discrete_sequence=["#FFA07A"], render_mode=render_mode(len(data)))  # Light Salmon
+    else:
+        fig = px.scatter(data, x=x_column, y=y_column, title=title, labels={x_column: x_label, y_column: y_label},
+                         color_discrete_sequence=["#FF7043"], render_mode=render_mode(len(data)))  # Soft Orange
+    return fig
+
+
+def display_figure(key, build):
+    # Show a cached figure, building it only on a cache miss
+    fig = get_figure_cache().get_or_build(key, build)
+    with span("serialize"):
+        st.plotly_chart(fig)
+
+
+# 🔹 Function to Display Charts
+def display_chart(data, x_column, y_column, title, x_label, y_label, chart_type, key=()):
+    # `key` identifies the dataset version, page and selections the data came from
+    display_figure(
+        (*key, x_column, y_column, title, x_label, y_label, chart_type),
+        lambda: build_chart(data, x_column, y_column, title, x_label, y_label, chart_type),
+    )
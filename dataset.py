@@ -0,0 +1,149 @@
+import logging
+import os
+import threading
+import time
+
+import streamlit as st
+
+from census import DATA_FILE, file_signature, freeze, ingest, read_chunks, shared
+from perf import count, span
+from rollups import Rollups, row_changes
+from search import NameIndex
+
+logger = logging.getLogger(__name__)
+
+# Files larger than this are streamed into the rollups in chunks, and the full
+# row-level frame is only read if something asks for it
+STREAMING_THRESHOLD_BYTES = 256 * 1024 * 1024
+
+
+class Dataset:
+    """Immutable, process-wide handle on one version of the census data.
+
+    Every session shares the same instance: the frame and the rollup tables are
+    backed by read-only arrays, and pages work on views of them.
+    """
+
+    def __init__(self, path, version, rollups, frame=None, changed_rows=None):
+        self.path = path
+        self.version = version
+        self.rollups = rollups
+        # Rows corrected since the previous version, when the rollups were
+        # patched from it rather than rebuilt
+        self.changed_rows = changed_rows
+        self._frame = frame
+        self._search_index = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, path, version, df):
+        frame = freeze(df)
+        with span("aggregate"):
+            rollups = Rollups.from_frame(frame)
+        return cls(path, version, rollups, frame)
+
+    @classmethod
+    def from_stream(cls, path, version, chunksize=100_000):
+        with span("aggregate"):
+            rollups = Rollups.from_chunks(read_chunks(path, chunksize))
+        return cls(path, version, rollups)
+
+    def reload(self, version):
+        # The next version of the dataset, from the changed file. When only
+        # values of existing rows changed, the rollups are patched with the
+        # differences; added, removed or renamed units rebuild them
+        if self._frame is None or os.path.getsize(self.path) > STREAMING_THRESHOLD_BYTES:
+            return open_dataset(self.path, version)
+        frame = ingest(self.path)
+        delta = row_changes(self._frame, frame)
+        if delta is None:
+            return Dataset.from_frame(self.path, version, frame)
+        return Dataset(self.path, version, self.rollups.updated(delta), freeze(frame), changed_rows=len(delta))
+
+    def _stored_frame(self):
+        # The frame itself, materialized on first use when the dataset was streamed
+        with self._lock:
+            if self._frame is None:
+                self._frame = freeze(ingest(self.path))
+            return self._frame
+
+    @property
+    def frame(self):
+        # Row-level data, as a copy sharing the frozen arrays
+        return shared(self._stored_frame())
+
+    @property
+    def search_index(self):
+        # Name lookup over every unit, built from the rollups on first search
+        with self._lock:
+            if self._search_index is None:
+                self._search_index = NameIndex(self.rollups)
+            return self._search_index
+
+
+def open_dataset(path, signature):
+    if os.path.getsize(path) > STREAMING_THRESHOLD_BYTES:
+        return Dataset.from_stream(path, signature)
+    return Dataset.from_frame(path, signature, ingest(path))
+
+
+class DatasetWatcher:
+    """Holds the current Dataset of a CSV and swaps in a new one when it changes.
+
+    A background thread polls the file signature. Sessions read `current` at
+    the top of every rerun, and a rerun in progress keeps the version it
+    started with, so nothing waits for a reload.
+    """
+
+    def __init__(self, path, interval=2.0):
+        self.path = path
+        self.interval = interval
+        self.current = open_dataset(path, file_signature(path))
+        self.reloads = 0
+        self.last_reload_ms = None
+        self._seen = self.current.version
+        self._failed = None
+        self._thread = threading.Thread(target=self._run, name="dataset-watcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.check()
+
+    def check(self):
+        # Reload once the signature has held still for a whole interval, so a
+        # file that is still being written isn't read half-way
+        try:
+            signature = file_signature(self.path)
+        except OSError:
+            return  # being replaced
+        previous, self._seen = self._seen, signature
+        if signature in (self.current.version, self._failed) or signature != previous:
+            return
+        started = time.perf_counter()
+        try:
+            dataset = self.current.reload(signature)
+        except (OSError, ValueError, KeyError):
+            # Keep serving the current version until the file changes again
+            logger.exception("Couldn't reload %s, still serving version %s", self.path, self.current.version)
+            self._failed = signature
+            return
+        self.last_reload_ms = 1000 * (time.perf_counter() - started)
+        self.reloads += 1
+        self.current = dataset
+
+
+@st.cache_resource
+def get_watcher(path):
+    count("dataset cache miss")
+    return DatasetWatcher(path).start()
+
+
+def load_dataset(path=DATA_FILE):
+    # Current version of the dataset. Editing the CSV doesn't need a restart:
+    # the watcher swaps in the new version and the next rerun picks it up
+    return get_watcher(str(path)).current
@@ -0,0 +1,261 @@
+import json
+import math
+import os
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from census import HIERARCHY, file_signature
+from perf import count
+from search import normalize
+
+# Bundled boundary files, one per hierarchy level: boundaries/province.geojson,
+# division.geojson, district.geojson and sub_division.geojson
+BOUNDARY_DIR = Path(__file__).with_name("boundaries")
+
+# Feature properties holding the unit's name (the first one present is used),
+# and an optional one holding its province, for names that repeat across
+# provinces
+NAME_PROPERTIES = ["name", "NAME", "shapeName"]
+PROVINCE_PROPERTY = "province"
+
+# Simplification tolerances in degrees, about 50 m to 5 km at Pakistan's
+# latitudes. Figures only ever use one of these, so they cache well
+TOLERANCES = [0.0005, 0.002, 0.01, 0.05]
+
+# Map width in pixels: detail finer than a pixel isn't worth sending
+MAP_PIXELS = 800
+
+# Bump whenever the cached arrays change so stale caches are rebuilt
+CACHE_FORMAT = 2
+
+
+def boundary_path(level, directory=None):
+    return Path(directory or BOUNDARY_DIR) / f"{level.lower().replace(' ', '_')}.geojson"
+
+
+def cache_path(path):
+    return Path(path).with_suffix(".simplified.npz")
+
+
+def vertex_thresholds(points, offsets, floor=0.0):
+    # Douglas-Peucker over every ring at once, one level of splits per pass.
+    # Each vertex gets the largest tolerance it survives: its distance from the
+    # chord it splits, capped by that of the vertices that split off the chord
+    # (a dropped chord is never split further). Ring ends are always kept.
+    # Chords are no longer split once capped at `floor`: their vertices get 0
+    thresholds = np.zeros(len(points))
+    starts, stops = offsets[:-1], offsets[1:] - 1
+    thresholds[starts] = thresholds[stops] = np.inf
+    limits = np.full(len(starts), np.inf)
+    while True:
+        split = (stops - starts >= 2) & (limits > floor)
+        starts, stops, limits = starts[split], stops[split], limits[split]
+        if not len(starts):
+            return thresholds
+        lengths = stops - starts - 1
+        first = np.cumsum(lengths) - lengths
+        chord = np.repeat(np.arange(len(starts)), lengths)
+        vertex = np.arange(lengths.sum()) - first[chord] + starts[chord] + 1
+
+        # Distance from the chord segment, not the line through it: a vertex
+        # that projects past either end (a spike, an inlet) is measured from
+        # that end. Closed rings start as a zero-length chord, where this is
+        # the distance from its point
+        a = points[starts][chord]
+        direction = points[stops][chord] - a
+        offset = points[vertex] - a
+        squared = np.einsum("ij,ij->i", direction, direction)
+        along = np.clip(np.einsum("ij,ij->i", offset, direction) / np.where(squared > 0, squared, 1), 0, 1)
+        gap = offset - along[:, None] * direction
+        distance = np.hypot(gap[:, 0], gap[:, 1])
+
+        # Farthest vertex of each chord (the first one on ties) splits it in two
+        farthest = np.flatnonzero(distance == np.maximum.reduceat(distance, first)[chord])
+        farthest = farthest[np.r_[True, chord[farthest[1:]] != chord[farthest[:-1]]]]
+        middle = vertex[farthest]
+        thresholds[middle] = np.minimum(distance[farthest], limits)
+        starts, stops = np.concatenate([starts, middle]), np.concatenate([middle, stops])
+        limits = np.tile(thresholds[middle], 2)
+
+
+def feature_polygons(geometry):
+    # Polygons of a GeoJSON geometry, each a list of rings (exterior first)
+    geometry = geometry or {}
+    if geometry.get("type") == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry.get("type") == "MultiPolygon":
+        return geometry["coordinates"]
+    return []
+
+
+class Boundaries:
+    """Polygons of one level's units, simplified at every tolerance at once.
+
+    Rings are stored as one array of vertices with, for each vertex, the
+    largest tolerance at which Douglas-Peucker keeps it, so the geometry at any
+    tolerance is a mask over the arrays. Every feature keeps at least a
+    triangle of its largest ring, so no unit disappears from the map.
+    """
+
+    # Arrays stored in the cache file
+    FIELDS = ["names", "provinces", "points", "thresholds", "offsets", "ring_feature", "ring_polygon", "ring_thresholds"]
+
+    def __init__(self, names, provinces, points, thresholds, offsets, ring_feature, ring_polygon, ring_thresholds):
+        self.names = names
+        self.provinces = provinces
+        self.points = points
+        self.thresholds = thresholds
+        self.offsets = offsets
+        self.ring_feature = ring_feature
+        self.ring_polygon = ring_polygon
+        self.ring_thresholds = ring_thresholds
+        # Bounding box of every ring, for the extent of any set of features
+        self.ring_min = np.minimum.reduceat(points, offsets[:-1]) if len(points) else np.zeros((0, 2))
+        self.ring_max = np.maximum.reduceat(points, offsets[:-1]) if len(points) else np.zeros((0, 2))
+        # Signature of the GeoJSON file, part of the figure cache keys
+        self.signature = None
+
+    @classmethod
+    def from_geojson(cls, path):
+        names, provinces, rings, ring_feature, ring_polygon = [], [], [], [], []
+        polygon_count = 0
+        for feature in json.loads(Path(path).read_text(encoding="utf-8"))["features"]:
+            properties = feature.get("properties") or {}
+            name = next((properties[key] for key in NAME_PROPERTIES if properties.get(key)), None)
+            polygons = [polygon for polygon in feature_polygons(feature.get("geometry")) if len(polygon[0]) >= 3]
+            if name is None or not polygons:
+                continue
+            for polygon in polygons:
+                for ring in polygon:
+                    ring = np.asarray(ring, dtype="float64")[:, :2]
+                    if (ring[0] != ring[-1]).any():
+                        ring = np.vstack([ring, ring[:1]])
+                    rings.append(ring)
+                    ring_feature.append(len(names))
+                    ring_polygon.append(polygon_count)
+                polygon_count += 1
+            names.append(str(name))
+            provinces.append(str(properties.get(PROVINCE_PROPERTY) or ""))
+        return cls.from_rings(names, provinces, rings, ring_feature, ring_polygon)
+
+    @classmethod
+    def from_rings(cls, names, provinces, rings, ring_feature, ring_polygon):
+        offsets = np.cumsum([0] + [len(ring) for ring in rings])
+        points = np.vstack(rings) if rings else np.zeros((0, 2))
+        thresholds = vertex_thresholds(points, offsets, floor=TOLERANCES[0])
+        ring_feature, ring_polygon = np.asarray(ring_feature, dtype="int64"), np.asarray(ring_polygon, dtype="int64")
+
+        # A ring needs two vertices besides its ends; it is dropped above the
+        # second largest tolerance among them, and a hole with its exterior
+        ring_thresholds = np.zeros(len(rings))
+        exteriors = np.ones(len(rings), dtype=bool)
+        exteriors[1:] = ring_polygon[1:] != ring_polygon[:-1]
+        for ring, (start, stop) in enumerate(zip(offsets[:-1], offsets[1:])):
+            inner = np.sort(thresholds[start + 1:stop - 1])
+            ring_thresholds[ring] = inner[-2] if len(inner) >= 2 else 0.0
+        exterior_of = np.maximum.accumulate(np.where(exteriors, np.arange(len(rings)), 0))
+        ring_thresholds = np.minimum(ring_thresholds, ring_thresholds[exterior_of])
+
+        # The largest exterior ring of every feature is kept at any tolerance
+        sizes = np.diff(offsets)
+        for feature in range(len(names)):
+            candidates = np.flatnonzero((ring_feature == feature) & exteriors)
+            if len(candidates):
+                ring = candidates[np.argmax(sizes[candidates])]
+                start, stop = offsets[ring], offsets[ring + 1]
+                inner = start + 1 + np.argsort(thresholds[start + 1:stop - 1])[-2:]
+                thresholds[inner] = np.inf
+                ring_thresholds[ring] = np.inf
+        return cls(np.asarray(names), np.asarray(provinces), points.astype("float32"),
+                   thresholds.astype("float32"), offsets, ring_feature, ring_polygon, ring_thresholds.astype("float32"))
+
+    @classmethod
+    def load(cls, path, signature):
+        # Read the simplified geometry cached next to the GeoJSON if it matches
+        # the file, otherwise parse and simplify it and write the cache
+        cache = cache_path(path)
+        try:
+            with np.load(cache) as arrays:
+                if str(arrays["signature"]) == f"{CACHE_FORMAT}:{signature}":
+                    boundaries = cls(*(arrays[name] for name in cls.FIELDS))
+                    boundaries.signature = signature
+                    return boundaries
+        except (OSError, KeyError, ValueError):
+            pass
+        boundaries = cls.from_geojson(path)
+        boundaries.save(cache, signature)
+        boundaries.signature = signature
+        return boundaries
+
+    def save(self, cache, signature):
+        # Write to a temporary file first so readers never see a partial cache
+        tmp_path = Path(cache).with_suffix(".tmp.npz")
+        try:
+            np.savez(tmp_path, signature=f"{CACHE_FORMAT}:{signature}",
+                     **{name: getattr(self, name) for name in self.FIELDS})
+            os.replace(tmp_path, cache)
+        except OSError:
+            # A read-only checkout still works, it just simplifies on every start
+            tmp_path.unlink(missing_ok=True)
+
+    def join(self, table, level):
+        # Row of `table` (a rollup level) for every feature, -1 where no unit
+        # has its name. A feature's province settles names that repeat
+        units = {}
+        for position, (province, name) in enumerate(zip(table["PROVINCE"], table[level])):
+            units.setdefault(normalize(name), []).append((normalize(province), position))
+        positions = np.full(len(self.names), -1)
+        for feature, (name, province) in enumerate(zip(self.names, self.provinces)):
+            candidates = units.get(normalize(name), [])
+            if candidates:
+                positions[feature] = next((p for unit_province, p in candidates if unit_province == normalize(province)), candidates[0][1])
+        return positions
+
+    def tolerance(self, features):
+        # Coarsest tolerance that stays under a pixel for the features' extent
+        rings = np.isin(self.ring_feature, features)
+        if not rings.any():
+            return TOLERANCES[0]
+        extent = (self.ring_max[rings].max(axis=0) - self.ring_min[rings].min(axis=0)).max()
+        return max((t for t in TOLERANCES if t <= extent / MAP_PIXELS), default=TOLERANCES[0])
+
+    def feature_collection(self, features, ids, tolerance):
+        # GeoJSON of the given features at the tolerance, with coordinates
+        # rounded to the tolerance's precision
+        decimals = max(0, math.ceil(-math.log10(tolerance)) + 1)
+        feature_ids = dict(zip(np.asarray(features).tolist(), ids))
+        polygons = {}
+        for ring in np.flatnonzero(np.isin(self.ring_feature, features) & (self.ring_thresholds > tolerance)):
+            start, stop = self.offsets[ring], self.offsets[ring + 1]
+            kept = self.points[start:stop][self.thresholds[start:stop] > tolerance]
+            polygons.setdefault(int(self.ring_feature[ring]), {}).setdefault(int(self.ring_polygon[ring]), []).append(
+                np.round(kept.astype("float64"), decimals).tolist())
+        return {
+            "type": "FeatureCollection",
+            "features": [
+                {"type": "Feature", "id": feature_ids[feature], "properties": {},
+                 "geometry": {"type": "MultiPolygon", "coordinates": list(rings.values())}}
+                for feature, rings in polygons.items()
+            ],
+        }
+
+
+@st.cache_resource(max_entries=len(HIERARCHY))
+def read_boundaries(path, signature):
+    count("boundary cache miss")
+    return Boundaries.load(path, signature)
+
+
+def has_boundaries(directory=None):
+    # Whether any level has a boundary file, i.e. whether there is a map to draw
+    return any(boundary_path(level, directory).exists() for level in HIERARCHY)
+
+
+def load_boundaries(level, directory=None):
+    # Boundaries of a level, or None if the level has no boundary file
+    path = boundary_path(level, directory)
+    if not path.exists():
+        return None
+    return read_boundaries(str(path), file_signature(path))
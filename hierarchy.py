@@ -0,0 +1,79 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from census import HIERARCHY
+
+
+class HierarchyIndex:
+    """Row ranges and child lists for every unit of a hierarchy-sorted frame."""
+
+    def __init__(self, df, levels=HIERARCHY):
+        self.df = df
+        n = len(df)
+
+        # Categorical codes of each hierarchy column, in order of first appearance
+        self.codes = {level: pd.factorize(df[level], sort=False)[0] for level in levels}
+
+        self._ranges = {(): (0, n)}
+        self._children = {}
+        # Row starts of each parent's children, so units of the deepest level
+        # (possibly millions of them) never need an entry of their own
+        self._starts = {}
+        parents = [()]
+        parent_starts = np.zeros(1, dtype="int64")
+        change = np.zeros(n, dtype=bool)
+        if n:
+            change[0] = True
+        for depth, level in enumerate(levels, start=1):
+            # A new unit starts wherever any code up to this level changes
+            codes = self.codes[level]
+            change[1:] |= codes[1:] != codes[:-1]
+            starts = np.flatnonzero(change)
+            names = np.asarray(df[level].to_numpy(), dtype=object)[starts]
+
+            # Children of each parent are a contiguous run of units
+            owner = np.searchsorted(parent_starts, starts, side="right") - 1
+            bounds = np.searchsorted(owner, np.arange(len(parents) + 1))
+            for parent, lo, hi in zip(parents, bounds[:-1].tolist(), bounds[1:].tolist()):
+                self._children[parent] = names[lo:hi].tolist()
+                self._starts[parent] = starts[lo:hi]
+
+            if depth < len(levels):
+                stops = np.append(starts[1:], n)
+                owners = owner.tolist()
+                parents = [parents[p] + (name,) for p, name in zip(owners, names.tolist())]
+                for path, start, stop in zip(parents, starts.tolist(), stops.tolist()):
+                    self._ranges[path] = (start, stop)
+                parent_starts = starts
+
+    def options(self, *path):
+        # Names one level below `path`, e.g. options("PUNJAB") lists its divisions
+        return self._children.get(tuple(path), [])
+
+    def span(self, *path):
+        # (start, stop) positions of the rows belonging to `path`
+        path = tuple(path)
+        if path in self._ranges:
+            return self._ranges[path]
+        parent = path[:-1]
+        try:
+            i = self._children[parent].index(path[-1])
+        except (KeyError, ValueError, IndexError):
+            return (0, 0)
+        starts = self._starts[parent]
+        stop = starts[i + 1] if i + 1 < len(starts) else self._ranges[parent][1]
+        return (int(starts[i]), int(stop))
+
+    def rebind(self, df):
+        # The same index over `df`, which must hold the same units in the same
+        # order (e.g. a table with corrected values)
+        index = copy.copy(self)
+        index.df = df
+        return index
+
+    def rows(self, *path):
+        # Contiguous slice (a view, not a copy) of the rows belonging to `path`
+        start, stop = self.span(*path)
+        return self.df.iloc[start:stop]
@@ -0,0 +1,268 @@
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError
+from tornado.websocket import websocket_connect
+
+from views import sidebar_pages
+
+APP = Path(__file__).with_name("new.py")
+
+# The server is only ever bound to, and driven on, the loopback interface
+HOST = "127.0.0.1"
+
+PAGE_LABEL = "Select Page"
+
+# Navigation scripts replayed by each simulated viewer. A step is either
+# ("page", label), or ("select", label fragment, option) where option "*"
+# picks one at random, as a viewer clicking through the selectboxes would
+SCRIPTS = {
+    "district drill-down": [
+        ("page", "📍 District-wise Insights"),
+        ("select", "Select Province", "*"),
+        ("select", "Select Division", "*"),
+        ("select", "Select District", "*"),
+    ],
+    "division drill-down": [
+        ("page", "📌 Division-wise Insights"),
+        ("select", "Select Province", "*"),
+        ("select", "Select Division", "*"),
+        ("page", "🏙️ Division-wise Gender Ratio Analysis"),
+        ("select", "Select Gender", "Comparison"),
+    ],
+    "province tour": [
+        ("page", "🏠 Home"),
+        ("page", "📈 Population Distribution"),
+        ("select", "Select Province", "*"),
+        ("page", "📊 Growth Rate Analysis"),
+        ("page", "🌆 Urban vs Rural Comparison"),
+        ("select", "Select Province", "*"),
+    ],
+    "browse every page": [("page", page) for page in sidebar_pages()],
+}
+
+
+class Session:
+    """One simulated browser tab, speaking Streamlit's websocket protocol."""
+
+    def __init__(self, url, rng):
+        self.url = url
+        self.rng = rng
+        self.widgets = {}  # label -> (widget type, id, options) from the last run
+        self.states = {}  # widget id -> WidgetState sent with every rerun
+        self.errors = 0
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url, max_message_size=512 * 1024 * 1024)
+        self.messages = asyncio.Queue()
+        self._reader = asyncio.ensure_future(self._read_forever())
+
+    async def _read_forever(self):
+        # Keep reading like a browser would, even between reruns: tornado only
+        # answers the server's pings while someone reads, and Streamlit drops
+        # sessions that miss them
+        while True:
+            raw = await self.ws.read_message()
+            await self.messages.put(raw)
+            if raw is None:
+                return
+
+    def close(self):
+        self._reader.cancel()
+        self.ws.close()
+
+    async def rerun(self):
+        # Ask for a rerun with the current widget values and wait for the
+        # script to finish; returns the latency in seconds
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.widget_states.widgets.extend(self.states.values())
+        started = time.perf_counter()
+        await self.ws.write_message(message.SerializeToString(), binary=True)
+
+        widgets = {}
+        while True:
+            raw = await self.messages.get()
+            if raw is None:
+                raise ConnectionError(f"server closed the session ({self.ws.close_code} {self.ws.close_reason})")
+            msg = ForwardMsg()
+            msg.ParseFromString(raw)
+            kind = msg.WhichOneof("type")
+            if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                element_type = element.WhichOneof("type")
+                widget = getattr(element, element_type)
+                if element_type == "exception":
+                    self.errors += 1
+                elif getattr(widget, "id", "") and hasattr(widget, "label"):
+                    widgets[widget.label] = (element_type, widget.id, list(getattr(widget, "options", [])))
+            elif kind == "script_finished" and msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                if msg.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    self.errors += 1
+                break
+        latency = time.perf_counter() - started
+
+        # Like a browser, only keep values of widgets the page still shows
+        self.widgets = widgets
+        ids = {widget_id for _, widget_id, _ in widgets.values()}
+        self.states = {widget_id: state for widget_id, state in self.states.items() if widget_id in ids}
+        return latency
+
+    def select(self, label_fragment, option):
+        # Set a radio or selectbox by option name ("*" for a random one);
+        # False if the page has no such widget
+        for label, (element_type, widget_id, options) in self.widgets.items():
+            if label_fragment in label and element_type in ("radio", "selectbox") and options:
+                index = self.rng.randrange(len(options)) if option == "*" else options.index(option)
+                self.states[widget_id] = WidgetState(id=widget_id, int_value=index)
+                return True
+        return False
+
+    async def play(self, script):
+        # Replay a navigation script and return the latency of each step
+        latencies = []
+        for step in script:
+            if step[0] == "page":
+                found = self.select(PAGE_LABEL, step[1])
+            else:
+                found = self.select(step[1], step[2])
+            if found:
+                latencies.append(await self.rerun())
+        return latencies
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def server_memory(pid):
+    # Current and peak resident memory of the server in MB (Linux /proc)
+    values = {}
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "VmHWM"):
+                    values[key] = int(value.split()[0]) / 1024
+    except OSError:
+        pass
+    return values.get("VmRSS"), values.get("VmHWM")
+
+
+def start_server(port, app=APP):
+    command = [
+        sys.executable, "-m", "streamlit", "run", str(app),
+        "--server.address", HOST, "--server.port", str(port),
+        "--server.headless", "true", "--browser.gatherUsageStats", "false",
+    ]
+    return subprocess.Popen(command, cwd=Path(app).parent, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_until_healthy(port, timeout=60):
+    client = AsyncHTTPClient()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await client.fetch(f"http://{HOST}:{port}/_stcore/health")
+            return
+        except (OSError, HTTPClientError):
+            await asyncio.sleep(0.2)
+    raise TimeoutError(f"the app did not start on port {port} within {timeout} s")
+
+
+async def run_level(sessions, duration, scripts):
+    # Every session replays scripts back to back until `duration` runs out
+    deadline = time.perf_counter() + duration
+
+    async def viewer(session):
+        latencies = []
+        names = list(scripts)
+        while time.perf_counter() < deadline:
+            played = await session.play(scripts[session.rng.choice(names)])
+            if not played:
+                # The last run showed no widgets (it failed): reload the app
+                played = [await session.rerun()]
+            latencies += played
+        return latencies
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(viewer(session) for session in sessions))
+    elapsed = time.perf_counter() - started
+    return [latency for latencies in results for latency in latencies], elapsed
+
+
+async def load_test(levels, duration=20.0, scripts=SCRIPTS, seed=0, app=APP, port=None):
+    port = port or free_port()
+    server = start_server(port, app)
+    url = f"ws://{HOST}:{port}/_stcore/stream"
+    rows = []
+    sessions = []
+    try:
+        await wait_until_healthy(port)
+        idle_rss, _ = server_memory(server.pid)
+        print(f"server pid {server.pid} on {HOST}:{port}, idle RSS {idle_rss or 0:,.0f} MB", file=sys.stderr)
+        for level in levels:
+            # Open sessions up to this level; each loads the app once first
+            while len(sessions) < level:
+                session = Session(url, random.Random(seed + len(sessions)))
+                await session.connect()
+                await session.rerun()
+                sessions.append(session)
+            errors = sum(session.errors for session in sessions)
+            latencies, elapsed = await run_level(sessions[:level], duration, scripts)
+            rss, peak = server_memory(server.pid)
+            p50, p95, p99 = (1000 * np.percentile(latencies, [50, 95, 99])) if latencies else (float("nan"),) * 3
+            rows.append({
+                "sessions": level,
+                "reruns": len(latencies),
+                "reruns_per_s": round(len(latencies) / elapsed, 2),
+                "p50_ms": round(p50, 1),
+                "p95_ms": round(p95, 1),
+                "p99_ms": round(p99, 1),
+                "rss_mb": round(rss or 0),
+                "peak_rss_mb": round(peak or 0),
+                "errors": sum(session.errors for session in sessions) - errors,
+            })
+            print(json.dumps(rows[-1], ensure_ascii=False), file=sys.stderr)
+    finally:
+        for session in sessions:
+            session.close()
+        server.terminate()
+        server.wait()
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drive N concurrent sessions against a local `streamlit run new.py`.")
+    parser.add_argument("--sessions", type=lambda s: [int(x) for x in s.split(",")], default=[1, 5, 10, 25],
+                        help="comma-separated concurrency levels (default: 1,5,10,25)")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per concurrency level")
+    parser.add_argument("--script", action="append", choices=list(SCRIPTS),
+                        help="navigation script to replay (repeatable; default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, help="local port for the server (default: a free one)")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    args = parser.parse_args()
+
+    scripts = {name: SCRIPTS[name] for name in args.script} if args.script else SCRIPTS
+    rows = asyncio.run(load_test(args.sessions, args.duration, scripts, args.seed, port=args.port))
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=1))
+
+    columns = list(rows[0]) if rows else []
+    print("  ".join(f"{name:>12}" for name in columns))
+    for row in rows:
+        print("  ".join(f"{row[name]:>12}" for name in columns))
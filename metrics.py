@@ -0,0 +1,114 @@
+import numpy as np
+
+AREAS = ["RURAL", "URBAN"]
+
+# Years between the 1998 and 2017 censuses
+INTERCENSAL_YEARS = 19
+
+# Counts that can simply be summed up the hierarchy. Household counts are
+# derived per row from population and average household size
+ADDITIVE_COLUMNS = ["AREA (sq.km)"] + [
+    f"{measure} ({area})"
+    for area in AREAS
+    for measure in ["ALL SEXES", "MALE", "FEMALE", "TRANSGENDER", "POPULATION 1998", "HOUSEHOLDS"]
+]
+
+# Counts that can be summed across units after derivation, e.g. into an
+# "Other" slice of a chart
+SUMMABLE_COLUMNS = ADDITIVE_COLUMNS + [
+    "TOTAL POPULATION", "MALE (TOTAL)", "FEMALE (TOTAL)", "TRANSGENDER (TOTAL)",
+    "POPULATION 1998 (TOTAL)", "HOUSEHOLDS (TOTAL)",
+]
+
+# Columns added by the derivation stage, with their compact per-row dtypes.
+# Rollup tables keep the 64-bit results
+DERIVED_SCHEMA = {
+    "HOUSEHOLDS (RURAL)": "float32",
+    "HOUSEHOLDS (URBAN)": "float32",
+    "TOTAL POPULATION": "int32",
+    "MALE (TOTAL)": "int32",
+    "FEMALE (TOTAL)": "int32",
+    "TRANSGENDER (TOTAL)": "int32",
+    "POPULATION 1998 (TOTAL)": "int32",
+    "HOUSEHOLDS (TOTAL)": "float32",
+    "SEX RATIO (TOTAL)": "float32",
+    "AVG HOUSEHOLD SIZE (TOTAL)": "float32",
+    "ANNUAL GROWTH RATE (TOTAL)": "float32",
+    "DENSITY (per sq.km)": "float32",
+    "URBAN SHARE (%)": "float32",
+    "TRANSGENDER SHARE (%)": "float32",
+}
+
+
+def ratio(numerator, denominator, scale=1.0):
+    # Element-wise division that yields 0 where the denominator is 0
+    numerator = np.asarray(numerator, dtype="float64")
+    denominator = np.asarray(denominator, dtype="float64")
+    out = np.zeros_like(numerator)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out * scale
+
+
+def compound_growth(start, end, years=INTERCENSAL_YEARS):
+    # Annual compound growth rate in percent; 0 where either census has no
+    # population (e.g. a tehsil reclassified from rural to urban)
+    growth = np.power(ratio(end, start), 1.0 / years) - 1.0
+    defined = (np.asarray(start) > 0) & (np.asarray(end) > 0)
+    return np.where(defined, growth * 100.0, 0.0)
+
+
+def households(df):
+    # Per-row household counts from the census's average household size
+    for area in AREAS:
+        df[f"HOUSEHOLDS ({area})"] = ratio(df[f"ALL SEXES ({area})"], df[f"AVG HOUSEHOLD SIZE ({area})"])
+    return df
+
+
+def area_ratios(df):
+    # Rebuild the per-area non-additive metrics from summed counts (rollups
+    # only: at row level the census's own values are kept)
+    for area in AREAS:
+        df[f"SEX RATIO ({area})"] = ratio(df[f"MALE ({area})"], df[f"FEMALE ({area})"], 100.0)
+        df[f"AVG HOUSEHOLD SIZE ({area})"] = ratio(df[f"ALL SEXES ({area})"], df[f"HOUSEHOLDS ({area})"])
+        df[f"ANNUAL GROWTH RATE ({area})"] = compound_growth(df[f"POPULATION 1998 ({area})"], df[f"ALL SEXES ({area})"])
+    return df
+
+
+def comparison(rows):
+    # Metrics for comparing any set of units side by side, computed for all of
+    # them at once from their rollup rows: facet -> series -> values
+    population = rows["TOTAL POPULATION"]
+    return {
+        "Gender split (%)": {
+            "Male": ratio(rows["MALE (TOTAL)"], population, 100.0),
+            "Female": ratio(rows["FEMALE (TOTAL)"], population, 100.0),
+        },
+        "Urban / rural split (%)": {
+            "Rural": ratio(rows["ALL SEXES (RURAL)"], population, 100.0),
+            "Urban": ratio(rows["ALL SEXES (URBAN)"], population, 100.0),
+        },
+        "Avg household size": {area.title(): rows[f"AVG HOUSEHOLD SIZE ({area})"].to_numpy() for area in AREAS + ["TOTAL"]},
+        "Annual growth rate (%)": {area.title(): rows[f"ANNUAL GROWTH RATE ({area})"].to_numpy() for area in AREAS + ["TOTAL"]},
+    }
+
+
+def derive_metrics(df):
+    # Urban + rural totals and the metrics built on them, in one vectorized
+    # pass over any frame holding the additive columns (rows or a rollup level)
+    def total(measure):
+        return df[f"{measure} (RURAL)"].astype("int64") + df[f"{measure} (URBAN)"]
+
+    df["TOTAL POPULATION"] = total("ALL SEXES")
+    df["MALE (TOTAL)"] = total("MALE")
+    df["FEMALE (TOTAL)"] = total("FEMALE")
+    df["TRANSGENDER (TOTAL)"] = total("TRANSGENDER")
+    df["POPULATION 1998 (TOTAL)"] = total("POPULATION 1998")
+    df["HOUSEHOLDS (TOTAL)"] = df["HOUSEHOLDS (RURAL)"].astype("float64") + df["HOUSEHOLDS (URBAN)"]
+
+    df["SEX RATIO (TOTAL)"] = ratio(df["MALE (TOTAL)"], df["FEMALE (TOTAL)"], 100.0)
+    df["AVG HOUSEHOLD SIZE (TOTAL)"] = ratio(df["TOTAL POPULATION"], df["HOUSEHOLDS (TOTAL)"])
+    df["ANNUAL GROWTH RATE (TOTAL)"] = compound_growth(df["POPULATION 1998 (TOTAL)"], df["TOTAL POPULATION"])
+    df["DENSITY (per sq.km)"] = ratio(df["TOTAL POPULATION"], df["AREA (sq.km)"])
+    df["URBAN SHARE (%)"] = ratio(df["ALL SEXES (URBAN)"], df["TOTAL POPULATION"], 100.0)
+    df["TRANSGENDER SHARE (%)"] = ratio(df["TRANSGENDER (TOTAL)"], df["TOTAL POPULATION"], 100.0)
+    return df
@@ -0,0 +1,127 @@
+import csv
+import io
+import json
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# Spans recorded around the hot path of a rerun. They may nest: on a cache
+# miss "load" includes the "aggregate" that builds the rollups
+SPANS = ["load", "filter", "aggregate", "build", "serialize"]
+
+# Streamlit runs each session's script in its own thread, so the trace of the
+# rerun in progress is per thread
+_local = threading.local()
+
+
+class Trace:
+    """Timing spans and counters of one script run."""
+
+    def __init__(self, page=None):
+        self.page = page
+        self.started = time.perf_counter()
+        self.total = None
+        self.seconds = Counter()
+        self.calls = Counter()
+        self.counts = Counter()
+        self.payloads = []
+
+    def add(self, name, seconds):
+        self.seconds[name] += seconds
+        self.calls[name] += 1
+
+    def breakdown(self):
+        # One row per span, in SPANS order, then any others
+        names = [name for name in SPANS if name in self.calls] + [name for name in self.calls if name not in SPANS]
+        return [{"span": name, "calls": self.calls[name], "ms": 1000 * self.seconds[name]} for name in names]
+
+
+def start_trace(page=None):
+    _local.trace = Trace(page)
+    return _local.trace
+
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+
+def finish_trace():
+    trace = current_trace()
+    if trace is not None:
+        trace.total = time.perf_counter() - trace.started
+        _local.trace = None
+    return trace
+
+
+@contextmanager
+def span(name):
+    # Time the block into the current rerun's trace; a no-op outside a rerun
+    # (CLI tools, benchmarks)
+    trace = current_trace()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, time.perf_counter() - start)
+
+
+def count(name, n=1):
+    # Counter such as "figure cache hit" in the current rerun's trace
+    trace = current_trace()
+    if trace is not None:
+        trace.counts[name] += n
+
+
+def record_payload(chart, size):
+    # Bytes of one chart's figure JSON sent in the current rerun
+    trace = current_trace()
+    if trace is not None:
+        trace.payloads.append((chart, size))
+        trace.counts["payload bytes"] += size
+
+
+class LatencyLog:
+    """Rolling per-page window of rerun timings, shared by every session."""
+
+    def __init__(self, max_reruns=1000):
+        self.max_reruns = max_reruns
+        self._reruns = defaultdict(lambda: deque(maxlen=max_reruns))
+        self._lock = threading.Lock()
+
+    def record(self, trace):
+        timings = {"total": trace.total, **trace.seconds}
+        with self._lock:
+            self._reruns[trace.page].append(timings)
+
+    def summary(self):
+        # p50/p95 in milliseconds of the total and of every span, per page
+        with self._lock:
+            reruns = {page: list(window) for page, window in self._reruns.items()}
+        rows = []
+        for page, window in reruns.items():
+            for name in ["total"] + SPANS:
+                values = [timings[name] for timings in window if name in timings]
+                if values:
+                    p50, p95 = 1000 * np.percentile(values, [50, 95])
+                    rows.append({"page": page, "span": name, "reruns": len(values), "p50_ms": round(p50, 2), "p95_ms": round(p95, 2)})
+        return rows
+
+    def to_json(self):
+        return json.dumps(self.summary(), ensure_ascii=False, indent=2)
+
+    def to_csv(self):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=["page", "span", "reruns", "p50_ms", "p95_ms"])
+        writer.writeheader()
+        writer.writerows(self.summary())
+        return buffer.getvalue()
+
+    def clear(self):
+        with self._lock:
+            self._reruns.clear()
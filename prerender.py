@@ -0,0 +1,374 @@
+import argparse
+import html
+import importlib
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import textwrap
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+import plotly.io as pio
+import streamlit as st
+from plotly.offline import get_plotlyjs
+
+import charts
+from charts import SNAPSHOT_DIR
+from census import DATA_FILE, file_signature
+from dataset import open_dataset
+from views import FIXED_CHART_PAGES, PAGES, sidebar_pages
+
+# Streamlit calls made by the pages, answered by a Recorder while rendering offline
+RECORDED_CALLS = [
+    "title", "subheader", "markdown", "write", "warning", "dataframe", "plotly_chart",
+    "selectbox", "radio", "slider", "multiselect", "columns",
+]
+
+
+class Recorder:
+    """Stand-in for Streamlit while a page renders outside the app.
+
+    Widgets return the option at the same position in `choices` (indices, in
+    the order the page creates its widgets) or their default, and are recorded
+    so the other options can be enumerated. Text, tables and figures are kept
+    in page order.
+    """
+
+    def __init__(self, choices=()):
+        self.choices = choices
+        self.widgets = []  # (label, options, chosen index, default index)
+        self.elements = []
+        self._key = None
+
+    def _choose(self, label, options, default):
+        options = list(options)
+        if not options:
+            return None
+        position = len(self.widgets)
+        index = self.choices[position] if position < len(self.choices) else default
+        self.widgets.append((label, options, index, default))
+        return options[index]
+
+    def selectbox(self, label, options, index=0, **kwargs):
+        return self._choose(label, options, index)
+
+    radio = selectbox
+
+    def slider(self, label, min_value=None, max_value=None, value=None, **kwargs):
+        # Sliders stay at their default; their ranges aren't enumerated
+        return value
+
+    def multiselect(self, label, options, default=None, **kwargs):
+        # Likewise multiselects: every subset would be far too many
+        return list(default or [])
+
+    def columns(self, spec, **kwargs):
+        return [_Column(self) for _ in range(spec if isinstance(spec, int) else len(spec))]
+
+    def title(self, body, **kwargs):
+        self.elements.append({"type": "title", "text": str(body)})
+
+    def subheader(self, body, **kwargs):
+        self.elements.append({"type": "subheader", "text": str(body)})
+
+    def markdown(self, body, **kwargs):
+        self.elements.append({"type": "markdown", "text": textwrap.dedent(str(body)).strip()})
+
+    write = markdown
+
+    def warning(self, body, **kwargs):
+        self.elements.append({"type": "warning", "text": str(body)})
+
+    def dataframe(self, data, **kwargs):
+        self.elements.append({"type": "table", "data": data})
+
+    # charts.display_figure asks the figure cache first, then shows the figure
+    def get_or_build(self, key, build):
+        self._key = key
+        return build()
+
+    def plotly_chart(self, fig, **kwargs):
+        self.elements.append({"type": "figure", "key": self._key, "figure": fig})
+        self._key = None
+
+    def selections(self):
+        return {label: str(options[index]) for label, options, index, _ in self.widgets}
+
+    def changed(self):
+        # Widgets moved off their default
+        return sum(index != default for _, _, index, default in self.widgets)
+
+
+class _Column:
+    # `with col:` blocks and col.<element>() calls both go to the recorder
+    def __init__(self, recorder):
+        self._recorder = recorder
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self._recorder, name)
+
+
+@contextmanager
+def recording(recorder):
+    saved = {name: getattr(st, name) for name in RECORDED_CALLS}
+    saved_cache = charts.get_figure_cache
+    for name in RECORDED_CALLS:
+        setattr(st, name, getattr(recorder, name))
+    charts.get_figure_cache = lambda: recorder
+    try:
+        yield recorder
+    finally:
+        for name, call in saved.items():
+            setattr(st, name, call)
+        charts.get_figure_cache = saved_cache
+
+
+def render_all(dataset, page, chart_type):
+    # Render the page once for every combination of widget choices, depth
+    # first. A render also shows the widgets after the given choices at their
+    # defaults, and each of those can be switched to any of its other options,
+    # e.g. every division of the chosen province
+    module = importlib.import_module(f"views.{PAGES[page]}")
+    pending = [()]
+    while pending:
+        choices = pending.pop()
+        with recording(Recorder(choices)) as recorder:
+            module.render(dataset, page, chart_type)
+        chosen = [index for _, _, index, _ in recorder.widgets]
+        for position in range(len(chosen) - 1, len(choices) - 1, -1):
+            options, index = recorder.widgets[position][1:3]
+            pending.extend((*chosen[:position], other) for other in reversed(range(len(options))) if other != index)
+        yield recorder
+
+
+def palette(template):
+    layout = pio.templates[template].layout
+    return [*layout.colorway, *(color for _, color in layout.colorscale.sequential),
+            *(color for _, color in layout.colorscale.diverging)]
+
+
+# Figures are built with Streamlit's template, whose colors are placeholders
+# ("#000001", ...) that its frontend fills in from the theme. Static pages use
+# Plotly's own template, and placeholders baked into traces map to its palette
+STATIC_COLORS = dict(zip(palette("streamlit"), palette("plotly")))
+PLACEHOLDER = re.compile(r"#0000[0-9]{2}")
+
+
+STATIC_TEMPLATE = pio.templates["plotly"].to_plotly_json()
+
+FIGURE_HTML = """<div id="{id}" class="plotly-graph-div"></div>
+<script>
+var figure = {figure};
+Plotly.newPlot("{id}", figure.data, figure.layout, {{responsive: true}});
+</script>"""
+
+
+def static_figure_html(figure, element_id):
+    # `figure` is the figure's JSON as a dict
+    text = json.dumps({**figure, "layout": {**figure["layout"], "template": STATIC_TEMPLATE}})
+    text = PLACEHOLDER.sub(lambda match: STATIC_COLORS.get(match[0], "#444444"), text)
+    return FIGURE_HTML.format(id=element_id, figure=text.replace("</", "<\\/"))
+
+
+PAGE_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="../plotly.min.js"></script>
+<style>
+body {{ font-family: sans-serif; max-width: 1100px; margin: 2em auto; color: #2C3E50; }}
+.selections {{ background: #E6F4EA; padding: 8px 12px; border-radius: 8px; }}
+.warning {{ background: #FFF3CD; padding: 8px 12px; }}
+</style>
+</head>
+<body>
+<p><a href="../index.html">All pages</a></p>
+{selections}
+{body}
+</body>
+</html>
+"""
+
+INDEX_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Pakistan Population Analysis: snapshots</title>
+<style>body {{ font-family: sans-serif; max-width: 1100px; margin: 2em auto; color: #2C3E50; }}</style>
+</head>
+<body>
+<h1>📊 Pakistan Population Analysis</h1>
+<p>{count:,} prerendered views of {source}, version {version}.</p>
+{body}
+</body>
+</html>
+"""
+
+
+def markdown_html(text):
+    # The little Markdown the pages use: paragraphs, ### headings and **bold**
+    blocks = []
+    for line in html.escape(text).splitlines():
+        line = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", line.strip())
+        heading = re.match(r"(#{1,6}) (.*)", line)
+        if heading:
+            blocks.append(f"<h{len(heading[1])}>{heading[2]}</h{len(heading[1])}>")
+        elif line and blocks and blocks[-1].startswith("<p>"):
+            blocks[-1] = blocks[-1][:-len("</p>")] + f" {line}</p>"
+        elif line:
+            blocks.append(f"<p>{line}</p>")
+    return "\n".join(blocks)
+
+
+def element_html(element, element_id):
+    # HTML of an element in its JSON form (see element_json)
+    kind = element["type"]
+    if kind == "title":
+        return f"<h1>{html.escape(element['text'])}</h1>"
+    if kind == "subheader":
+        return f"<h3>{html.escape(element['text'])}</h3>"
+    if kind == "warning":
+        return f'<p class="warning">{html.escape(element["text"])}</p>'
+    if kind == "table":
+        return pd.DataFrame(**element["data"]).to_html()
+    if kind == "figure":
+        return static_figure_html(element["figure"], element_id)
+    return markdown_html(element["text"])
+
+
+def element_json(element):
+    if element["type"] == "table":
+        return {"type": "table", "data": json.loads(element["data"].to_json(orient="split"))}
+    if element["type"] == "figure":
+        return {"type": "figure", "key": element["key"], "figure": json.loads(element["figure"].to_json())}
+    return element
+
+
+def write_snapshot(out_dir, name, page, chart_type, recorder):
+    selections = recorder.selections()
+    elements = [element_json(element) for element in recorder.elements]
+    described = [f"{html.escape(label)}: <b>{html.escape(value)}</b>" for label, value in selections.items()]
+    choices = " · ".join([html.escape(chart_type)] + described if chart_type else described)
+    (out_dir / "pages" / f"{name}.html").write_text(PAGE_HTML.format(
+        title=html.escape(page),
+        selections=f'<p class="selections">{choices}</p>' if choices else "",
+        body="\n".join(element_html(element, f"element-{number}") for number, element in enumerate(elements)),
+    ), encoding="utf-8")
+    (out_dir / "pages" / f"{name}.json").write_text(json.dumps({
+        "page": page,
+        "chart_type": chart_type,
+        "selections": selections,
+        "elements": elements,
+    }, ensure_ascii=False, default=str), encoding="utf-8")
+    return {
+        "page": page,
+        "chart_type": chart_type,
+        "selections": selections,
+        "changed": recorder.changed(),
+        "figures": sum(element["type"] == "figure" for element in recorder.elements),
+        "html": f"pages/{name}.html",
+        "json": f"pages/{name}.json",
+    }
+
+
+# Each worker process loads the dataset once
+_dataset = None
+
+
+def _load_worker_dataset(path):
+    global _dataset
+    logging.disable(logging.WARNING)  # bare-mode Streamlit warnings
+    _dataset = open_dataset(path, file_signature(path))
+
+
+def prerender_page(task):
+    # All snapshots of one page and chart type; returns their index entries
+    page, chart_type, out_dir = task
+    stem = PAGES[page] if chart_type is None else f"{PAGES[page]}-{charts.CHART_TYPES.index(chart_type)}"
+    return [
+        write_snapshot(Path(out_dir), f"{stem}-{number:04d}", page, chart_type, recorder)
+        for number, recorder in enumerate(render_all(_dataset, page, chart_type or charts.CHART_TYPES[0]))
+    ]
+
+
+def prerender(path=DATA_FILE, out_dir=SNAPSHOT_DIR, pages=None, workers=None):
+    # Snapshot every sidebar page for both sidebar chart types and every
+    # selection, across a pool of processes, and write the index
+    out_dir = Path(out_dir)
+    shutil.rmtree(out_dir / "pages", ignore_errors=True)
+    (out_dir / "pages").mkdir(parents=True)
+    tasks = [
+        (page, chart_type, str(out_dir))
+        for page in pages or sidebar_pages()
+        for chart_type in ([None] if page in FIXED_CHART_PAGES else charts.CHART_TYPES[:2])
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _load_worker_dataset(path)
+        results = list(map(prerender_page, tasks))
+    else:
+        with ProcessPoolExecutor(workers, initializer=_load_worker_dataset, initargs=(path,)) as pool:
+            results = list(pool.map(prerender_page, tasks))
+    snapshots = [entry for entries in results for entry in entries]
+
+    index = {"source": str(path), "version": file_signature(path), "snapshots": snapshots}
+    (out_dir / "index.json").write_text(json.dumps(index, ensure_ascii=False, indent=1), encoding="utf-8")
+    (out_dir / "plotly.min.js").write_text(get_plotlyjs(), encoding="utf-8")
+    write_index_html(out_dir, index)
+    return index
+
+
+def write_index_html(out_dir, index):
+    sections = []
+    for page in PAGES:
+        links = [
+            f'<li><a href="{entry["html"]}">'
+            + html.escape(" · ".join(filter(None, [entry["chart_type"], *entry["selections"].values()])) or "Default view")
+            + "</a></li>"
+            for entry in index["snapshots"] if entry["page"] == page
+        ]
+        if links:
+            sections.append(f"<h2>{html.escape(page)}</h2>\n<ul>\n" + "\n".join(links) + "\n</ul>")
+    (out_dir / "index.html").write_text(INDEX_HTML.format(
+        count=len(index["snapshots"]),
+        source=html.escape(Path(index["source"]).name),
+        version=html.escape(index["version"]),
+        body="\n".join(sections),
+    ), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prerender every page and selection to static HTML and JSON.")
+    parser.add_argument("--data", default=DATA_FILE, help="census CSV (default: the bundled one)")
+    parser.add_argument("--out", type=Path, default=SNAPSHOT_DIR)
+    parser.add_argument("--page", action="append", choices=list(PAGES), help="page to render (repeatable; default: all)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    started = time.perf_counter()
+    index = prerender(args.data, args.out, args.page, args.workers)
+    elapsed = time.perf_counter() - started
+    snapshots = index["snapshots"]
+    figures = sum(entry["figures"] for entry in snapshots)
+    size = sum(file.stat().st_size for file in args.out.rglob("*") if file.is_file())
+    print(f"{len(snapshots):,} snapshots, {figures:,} figures in {elapsed:.1f} s, "
+          f"{size / 1024 / 1024:,.1f} MB in {args.out}", file=sys.stderr)
+    for page in PAGES:
+        count = sum(entry["page"] == page for entry in snapshots)
+        if count:
+            print(f"  {page:45s} {count:6,}", file=sys.stderr)
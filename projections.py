@@ -0,0 +1,40 @@
+import numpy as np
+import streamlit as st
+
+from metrics import AREAS
+from perf import count, span
+
+# Reference year of the population counts the projections start from
+CENSUS_YEAR = 2017
+
+
+def project(population, rate, years, base_year=CENSUS_YEAR):
+    # Compound growth for every unit and every target year in one broadcast:
+    # population (units,) x growth (units,) x years (n,) -> (units, n)
+    population = np.asarray(population, dtype="float64")[:, None]
+    growth = np.log1p(np.asarray(rate, dtype="float64") / 100.0)[:, None]
+    elapsed = np.asarray(years, dtype="float64")[None, :] - base_year
+    return population * np.exp(growth * elapsed)
+
+
+def project_table(table, years, area="TOTAL"):
+    # Rural and urban populations grow at their own rates; the total is their sum
+    if area == "TOTAL":
+        return sum(project_table(table, years, area) for area in AREAS)
+    return project(table[f"ALL SEXES ({area})"], table[f"ANNUAL GROWTH RATE ({area})"], years)
+
+
+@st.cache_resource(max_entries=64)
+def _load_projection(_dataset, version, level, first_year, last_year, area):
+    count("projection cache miss")
+    years = np.arange(first_year, last_year + 1)
+    with span("aggregate"):
+        values = project_table(_dataset.rollups.table(level), years, area)
+    values.flags.writeable = False
+    return years, values
+
+
+def load_projection(dataset, level, first_year, last_year, area="TOTAL"):
+    # Projection of every unit at `level`, cached per dataset version and parameters.
+    # Rows line up with dataset.rollups.table(level)
+    return _load_projection(dataset, dataset.version, level, first_year, last_year, area)
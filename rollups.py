@@ -0,0 +1,213 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from census import HIERARCHY, compact, fits, freeze, shared, sort_by_hierarchy
+from hierarchy import HierarchyIndex
+from metrics import ADDITIVE_COLUMNS, area_ratios, derive_metrics
+from perf import span
+
+
+def widen(df, codes=None):
+    # Hierarchy keys as plain strings (or the given integer codes) and 64-bit
+    # sums, so country-level totals can't overflow the compact per-row types
+    columns = dict(codes) if codes is not None else {level: df[level].astype(str) for level in HIERARCHY}
+    for col in ADDITIVE_COLUMNS:
+        columns[col] = df[col].astype("float64" if df[col].dtype.kind == "f" else "int64")
+    return pd.DataFrame(columns)
+
+
+def level_sums(base, keys):
+    return base.groupby(keys, sort=False)[ADDITIVE_COLUMNS].sum().reset_index()
+
+
+def row_changes(old, new):
+    # Differences of the additive columns in the rows that changed between two
+    # hierarchy-sorted frames, keyed by hierarchy. None unless both hold the
+    # same units in the same order, i.e. only values were corrected
+    if len(old) != len(new):
+        return None
+    for level in HIERARCHY:
+        if not np.array_equal(old[level].to_numpy(dtype=object), new[level].to_numpy(dtype=object)):
+            return None
+    changed = np.zeros(len(new), dtype=bool)
+    for col in ADDITIVE_COLUMNS:
+        changed |= old[col].to_numpy() != new[col].to_numpy()
+    rows = np.flatnonzero(changed)
+    delta = widen(new.iloc[rows]).reset_index(drop=True)
+    before = widen(old.iloc[rows])
+    for col in ADDITIVE_COLUMNS:
+        delta[col] -= before[col].to_numpy()
+    return delta
+
+
+def replace_rows(table, positions, rows):
+    # Copy of `table` with new values for the rows at `positions`; integer
+    # columns that the new values don't fit are widened
+    columns = {}
+    for col in table:
+        values = table[col].to_numpy()
+        if col in rows and col not in HIERARCHY:
+            new = rows[col].to_numpy()
+            values = values.copy() if fits(new, values.dtype.name) else values.astype(new.dtype)
+            values[positions] = new
+        columns[col] = values
+    return pd.DataFrame(columns)
+
+
+class Vocabulary:
+    """Name -> integer code mapping that grows as a stream of chunks is read."""
+
+    def __init__(self):
+        self.codes = {}
+
+    def encode(self, column):
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # Encode the chunk's few categories, then map its codes through them
+            return self.encode(pd.Series(column.cat.categories))[column.cat.codes]
+        lookup = self.codes
+        return np.fromiter((lookup.setdefault(name, len(lookup)) for name in column), dtype="int64", count=len(column))
+
+    def decode(self, codes):
+        return np.array(list(self.codes), dtype=object)[codes]
+
+
+class Rollups:
+    """Pre-aggregated tables for every level of the administrative hierarchy."""
+
+    def __init__(self, sums):
+        # `sums` maps each level to its summed additive columns, sorted by
+        # hierarchy (see census.sort_by_hierarchy). The frames are taken over,
+        # not copied
+        self.tables = {}
+        self.indexes = {}
+        for depth, level in enumerate(HIERARCHY, start=1):
+            keys = HIERARCHY[:depth]
+            table = derive_metrics(area_ratios(sums[level]))
+            if depth == len(HIERARCHY):
+                # The leaf level has about as many units as there are rows, so it
+                # uses the rows' compact types
+                table = compact(table)
+            self.tables[level] = freeze(table)
+
+            # Index the level by every ancestor prefix, e.g. districts by (province,)
+            # and by (province, division), so pages never scan or group at runtime
+            self.indexes[level] = HierarchyIndex(self.tables[level], levels=keys)
+
+        self._totals = self._country_totals()
+
+    def _country_totals(self):
+        # Country-wide totals, derived the same way as every other level
+        total = self.tables["PROVINCE"][ADDITIVE_COLUMNS].sum().to_frame().T
+        return derive_metrics(area_ratios(total)).iloc[0]
+
+    @classmethod
+    def from_frame(cls, df):
+        # `df` must be hierarchy-sorted, which keeps every level's table sorted too
+        base = widen(df)
+        return cls({level: level_sums(base, HIERARCHY[:depth]) for depth, level in enumerate(HIERARCHY, start=1)})
+
+    @classmethod
+    def from_chunks(cls, chunks, compact_every=16):
+        # Fold a stream of cleaned chunks (census.read_chunks) into the level
+        # sums. Names are grouped as integer codes and partial sums are
+        # re-aggregated every few chunks, so memory is bounded by the number
+        # of units rather than the number of rows
+        vocabularies = {level: Vocabulary() for level in HIERARCHY}
+        partials = {level: [] for level in HIERARCHY}
+        for chunk in chunks:
+            base = widen(chunk, {level: vocabularies[level].encode(chunk[level]) for level in HIERARCHY})
+            for depth, level in enumerate(HIERARCHY, start=1):
+                keys = HIERARCHY[:depth]
+                partials[level].append(level_sums(base, keys))
+                if len(partials[level]) >= compact_every:
+                    partials[level] = [level_sums(pd.concat(partials[level]), keys)]
+
+        sums = {}
+        for depth, level in enumerate(HIERARCHY, start=1):
+            keys = HIERARCHY[:depth]
+            table = sort_by_hierarchy(level_sums(pd.concat(partials[level]), keys), keys)
+            for key in keys:
+                table[key] = vocabularies[key].decode(table[key].to_numpy())
+            sums[level] = table
+        return cls(sums)
+
+    def updated(self, delta):
+        # New rollups with `delta` (see row_changes) added in. Only the units
+        # above changed rows are re-derived, and the units themselves are
+        # unchanged, so every index is reused
+        rollups = copy.copy(self)
+        rollups.tables = dict(self.tables)
+        rollups.indexes = dict(self.indexes)
+        for depth, level in enumerate(HIERARCHY, start=1):
+            keys = HIERARCHY[:depth]
+            changes = level_sums(delta, keys)
+            if changes.empty:
+                continue
+            index = self.indexes[level]
+            positions = np.array([index.span(*path)[0] for path in changes[keys].itertuples(index=False, name=None)])
+            rows = self.tables[level].iloc[positions]
+            rows = widen(rows, {key: rows[key] for key in keys}).reset_index(drop=True)
+            for col in ADDITIVE_COLUMNS:
+                rows[col] += changes[col].to_numpy()
+            table = replace_rows(self.tables[level], positions, derive_metrics(area_ratios(rows)))
+            rollups.tables[level] = freeze(table)
+            rollups.indexes[level] = index.rebind(rollups.tables[level])
+        rollups._totals = rollups._country_totals()
+        return rollups
+
+    def options(self, *path):
+        # Names one level below `path`, for the cascading selectboxes
+        with span("filter"):
+            return self.indexes[HIERARCHY[-1]].options(*path)
+
+    def table(self, level):
+        return shared(self.tables[level])
+
+    def children(self, level, *path):
+        # Rows of `level` below the given ancestor path, in source order
+        with span("filter"):
+            return self.indexes[level].rows(*path)
+
+    def span(self, level, *path):
+        # Positions of children(level, *path) within table(level)
+        with span("filter"):
+            return self.indexes[level].span(*path)
+
+    def row(self, *path):
+        # Aggregated values of a single unit, e.g. row("PUNJAB", "LAHORE DIVISION")
+        with span("filter"):
+            return self.indexes[HIERARCHY[len(path) - 1]].rows(*path).iloc[0]
+
+    def totals(self):
+        return self._totals
+
+
+if __name__ == "__main__":
+    import argparse
+    import resource
+    import time
+
+    from census import read_chunks
+
+    parser = argparse.ArgumentParser(description="Stream a census CSV into the rollups and report throughput.")
+    parser.add_argument("path")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rows = 0
+
+    def counted(chunks):
+        global rows
+        for chunk in chunks:
+            rows += len(chunk)
+            yield chunk
+
+    started = time.perf_counter()
+    rollups = Rollups.from_chunks(counted(read_chunks(args.path, args.chunksize)))
+    elapsed = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    units = ", ".join(f"{len(table):,} {level.lower()}" for level, table in rollups.tables.items())
+    print(f"{rows:,} rows in {elapsed:.1f} s ({rows / elapsed:,.0f} rows/s), peak RSS {peak_mb:,.0f} MB")
+    print(f"units: {units}")
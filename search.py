@@ -0,0 +1,66 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from census import HIERARCHY
+
+
+# Words naming the kind of unit; almost every name has one, so they'd only
+# dilute the match ("LAHORE DIVISION", "LAHORE DISTRICT", "LAHORE CITY TEHSIL")
+UNIT_WORDS = {"division", "district", "tehsil", "taluka", "sub"}
+
+
+def normalize(name):
+    # Case- and punctuation-insensitive form without unit words, e.g.
+    # "D.G.KHAN DIVISION" -> "d g khan"
+    words = re.sub(r"[^0-9a-z]+", " ", str(name).casefold()).split()
+    return " ".join(word for word in words if word not in UNIT_WORDS) or " ".join(words)
+
+
+def trigrams(name):
+    # Padded at the front so that prefixes match strongly
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Trigram index over the names of every unit at every hierarchy level.
+
+    A lookup only touches the postings of the query's trigrams, so it stays
+    well under a millisecond for thousands of units, and misspellings still
+    share most trigrams with the right name.
+    """
+
+    def __init__(self, rollups):
+        self.levels = []
+        self.paths = []
+        for depth, level in enumerate(HIERARCHY, start=1):
+            paths = list(rollups.table(level)[HIERARCHY[:depth]].itertuples(index=False, name=None))
+            self.levels += [level] * len(paths)
+            self.paths += paths
+
+        # (trigram, unit) pairs grouped by trigram into one postings array
+        grams = [trigrams(normalize(path[-1])) for path in self.paths]
+        self.sizes = np.array([len(g) for g in grams], dtype="int32")
+        units = np.repeat(np.arange(len(grams), dtype="int32"), self.sizes)
+        codes, names = pd.factorize(np.array([gram for g in grams for gram in g], dtype=object))
+        order = np.argsort(codes, kind="stable")
+        self.postings = units[order]
+        bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+        self.grams = {gram: (start, stop) for gram, start, stop in zip(names, bounds[:-1].tolist(), bounds[1:].tolist())}
+
+    def search(self, query, limit=8, min_score=0.2):
+        # Best matches as (level, path, score), most similar first; the score is
+        # the Jaccard similarity of the trigram sets
+        grams = trigrams(normalize(query))
+        hits = [self.postings[slice(*self.grams[gram])] for gram in grams if gram in self.grams]
+        if not hits:
+            return []
+        units, shared = np.unique(np.concatenate(hits), return_counts=True)
+        scores = shared / (len(grams) + self.sizes[units] - shared)
+        keep = scores >= min_score
+        units, scores = units[keep], scores[keep]
+        # Highest score first, then coarser levels (units are numbered by level)
+        best = np.lexsort((units, -scores))[:limit]
+        return [(self.levels[i], self.paths[i], float(s)) for i, s in zip(units[best].tolist(), scores[best].tolist())]
@@ -0,0 +1,92 @@
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from census import DATA_FILE, HIERARCHY
+from geo import boundary_path
+
+
+def scaled(df, factor):
+    # `factor` copies of the census, with sub-division names suffixed so every
+    # copy adds new leaf units under the same provinces, divisions and districts
+    for copy in range(factor):
+        part = df.copy()
+        if copy:
+            part["SUB DIVISION"] = part["SUB DIVISION"] + f" #{copy}"
+        yield part
+
+
+def split(df, factor):
+    # Each sub-division divided into `factor` village-level rows with the same
+    # hierarchy path. Counts are split exactly, so every rollup keeps the
+    # census's own totals
+    counts = [col for col in df if col not in HIERARCHY and pd.api.types.is_integer_dtype(df[col])]
+    for village in range(factor):
+        part = df.copy()
+        part[counts] = df[counts] // factor + (df[counts] % factor > village)
+        part["AREA (sq.km)"] = df["AREA (sq.km)"] / factor
+        yield part
+
+
+def write_scaled_csv(path, factor=None, rows=None, source=DATA_FILE, batch_rows=100_000, villages=False):
+    # Write a batch of copies at a time, so files far larger than memory can be made
+    if villages:
+        df = pd.read_csv(source, thousands=",", dtype={col: str for col in HIERARCHY})
+    else:
+        df = pd.read_csv(source, dtype=str)
+    if factor is None:
+        factor = -(-rows // len(df))
+    per_batch = max(1, batch_rows // len(df))
+    batch = []
+    first = True
+    parts = split(df, factor) if villages else scaled(df, factor)
+    for copy, part in enumerate(parts, start=1):
+        batch.append(part)
+        if len(batch) == per_batch or copy == factor:
+            pd.concat(batch).to_csv(path, mode="w" if first else "a", header=first, index=False)
+            batch = []
+            first = False
+    return factor * len(df)
+
+
+def write_boundaries(directory, rollups, vertices=500, seed=0):
+    # Placeholder boundary files (see geo.py) for every level of `rollups`:
+    # each unit is a wobbly ring of `vertices` points in its own cell of a
+    # grid over Pakistan's bounding box. Not real geography, only shapes with
+    # the size and vertex counts the map page has to handle
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    for level in HIERARCHY:
+        table = rollups.table(level)
+        side = int(np.ceil(np.sqrt(len(table))))
+        width, height = 16 / side, 13 / side
+        features = []
+        for cell, (province, name) in enumerate(zip(table["PROVINCE"], table[level])):
+            radius = 0.45 * min(width, height) * (1 + 0.15 * np.sin(5 * angles + rng.uniform(0, 6))
+                                                  + 0.03 * np.cumsum(rng.normal(size=vertices)) / np.sqrt(vertices))
+            x = 61 + (cell % side + 0.5) * width + radius * np.cos(angles)
+            y = 24 + (cell // side + 0.5) * height + radius * np.sin(angles)
+            ring = np.column_stack([x, y])
+            features.append({
+                "type": "Feature",
+                "properties": {"name": str(name), "province": str(province)},
+                "geometry": {"type": "Polygon", "coordinates": [np.vstack([ring, ring[:1]]).round(6).tolist()]},
+            })
+        boundary_path(level, directory).write_text(json.dumps({"type": "FeatureCollection", "features": features}), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic census extract with the bundled CSV's hierarchy.")
+    parser.add_argument("path")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--factor", type=int, help="number of copies of the bundled CSV")
+    group.add_argument("--rows", type=int, help="approximate number of rows")
+    parser.add_argument("--villages", action="store_true",
+                        help="split each sub-division into village rows instead of adding new sub-divisions")
+    args = parser.parse_args()
+    written = write_scaled_csv(args.path, args.factor, args.rows, villages=args.villages)
+    print(f"wrote {written:,} rows to {args.path}")
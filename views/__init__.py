@@ -0,0 +1,66 @@
+import importlib
+
+import streamlit as st
+
+import geo
+
+# Sidebar label -> module under views/ that renders the page. Each module
+# defines render(dataset, page, chart_type) and is imported, together with its
+# own dependencies (Plotly, projections, ...), the first time its page is shown
+PAGES = {
+    "🏠 Home": "home",
+    "📈 Population Distribution": "population_distribution",
+    "👥 Gender Ratio Analysis": "gender_ratio",
+    "🏙️ Division-wise Gender Ratio Analysis": "division_gender_ratio",
+    "📊 Growth Rate Analysis": "growth_rate",
+    "🌆 Urban vs Rural Comparison": "urban_rural",
+    "🌈 Transgender Population Analysis": "transgender",
+    "🏡 Division-wise Household Size Analysis": "division_household_size",
+    "🏠 Household Size Analysis": "household_size",
+    "📍 District-wise Insights": "district_insights",
+    "📌 Division-wise Insights": "division_insights",
+    "🗺️ Province-wise Insights": "province_insights",
+    "⚖️ Region Comparison": "comparison",
+    "🧭 Population Map": "population_map",
+    "🔮 Population Projections": "population_projections",
+}
+
+# Page drawn from the boundary files under geo.BOUNDARY_DIR
+MAP_PAGE = "🧭 Population Map"
+
+# Pages that draw their own charts and ignore the sidebar chart type
+FIXED_CHART_PAGES = ["🏠 Home", "⚖️ Region Comparison", "🧭 Population Map", "🔮 Population Projections"]
+
+# Session state key of the sidebar page radio
+PAGE_KEY = "page"
+
+# Insight page showing a unit of each level, with the keys of its cascading
+# selectboxes. Sub-divisions open their district
+INSIGHT_PAGES = {
+    "PROVINCE": ("🗺️ Province-wise Insights", ["province_insights"]),
+    "DIVISION": ("📌 Division-wise Insights", ["province_1", "division_insights"]),
+    "DISTRICT": ("📍 District-wise Insights", ["district_insights_province", "district_insights_division", "district_insights_district"]),
+}
+INSIGHT_PAGES["SUB DIVISION"] = INSIGHT_PAGES["DISTRICT"]
+
+
+def open_unit(level, path):
+    # Button callback of a search result: runs before the rerun, so the page
+    # radio and the insight page's selectboxes already show the unit
+    page, keys = INSIGHT_PAGES[level]
+    st.session_state[PAGE_KEY] = page
+    for key, name in zip(keys, path):
+        st.session_state[key] = name
+    st.session_state["search_query"] = ""
+
+
+def sidebar_pages():
+    # Pages offered in the sidebar: the map only once a level has a boundary
+    # file, so it never shows up as a page without a map
+    return [page for page in PAGES if page != MAP_PAGE or geo.has_boundaries()]
+
+
+def render_page(page, dataset, chart_type):
+    # Python keeps imported modules, so later reruns only call render()
+    module = importlib.import_module(f"{__name__}.{PAGES[page]}")
+    module.render(dataset, page, chart_type)
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from census import HIERARCHY
+from charts import DISPLAY_DECIMALS, display_figure
+from metrics import comparison
+
+# Levels that can be compared, by radio label
+LEVELS = {"Provinces": "PROVINCE", "Divisions": "DIVISION", "Districts": "DISTRICT"}
+
+# Columns of the summary table under the chart
+SUMMARY_COLUMNS = [
+    "TOTAL POPULATION", "SEX RATIO (TOTAL)", "TRANSGENDER SHARE (%)", "URBAN SHARE (%)",
+    "AVG HOUSEHOLD SIZE (TOTAL)", "ANNUAL GROWTH RATE (TOTAL)", "DENSITY (per sq.km)",
+]
+
+
+def unit_label(path):
+    # Division names repeat across provinces, so lower levels carry their province
+    return path[0] if len(path) == 1 else f"{path[-1]} ({path[0]})"
+
+
+# Region Comparison Page
+def render(dataset, page, chart_type):
+    rollups = dataset.rollups
+
+    st.title("Region Comparison")
+    st.write("Pick any provinces, divisions or districts to compare them side by side.")
+
+    level = LEVELS[st.radio("🗂️ Compare", list(LEVELS), index=0, horizontal=True, key="comparison_level")]
+    units = list(rollups.table(level)[HIERARCHY[:HIERARCHY.index(level) + 1]].itertuples(index=False, name=None))
+    selected = st.multiselect(f"📍 Select {level.title()}s", units, default=units[:5], format_func=unit_label,
+                              key=f"comparison_{level}")
+    if not selected:
+        st.warning("Select at least one unit to compare.")
+        return
+
+    # Rows of every selected unit in one take from the level's rollup table
+    positions = [rollups.span(level, *path)[0] for path in selected]
+    rows = rollups.table(level).iloc[positions]
+    names = [unit_label(path) for path in selected]
+
+    def build_comparison():
+        # Every metric of every unit in one long frame, drawn as one faceted
+        # figure however many units are selected
+        facets = comparison(rows)
+        series = [(facet, name, values) for facet, columns in facets.items() for name, values in columns.items()]
+        comparison_df = pd.DataFrame({
+            level.title(): np.tile(names, len(series)),
+            "Metric": np.repeat([facet for facet, _, _ in series], len(names)),
+            "Series": np.repeat([name for _, name, _ in series], len(names)),
+            "Value": np.concatenate([values for _, _, values in series]).astype("float64").round(DISPLAY_DECIMALS),
+        })
+        fig = px.bar(comparison_df, x=level.title(), y="Value", color="Series", facet_row="Metric",
+                     barmode="group", height=220 * len(facets) + 120,
+                     title=f"{level.title()} Comparison", category_orders={"Metric": list(facets)},
+                     color_discrete_map={"Male": "#1f77b4", "Female": "#ff7f0e", "Rural": "#66BB6A",
+                                         "Urban": "#4682B4", "Total": "#9370DB"})
+        # Each facet has its own scale, labelled by its metric
+        fig.update_yaxes(matches=None, title_text="")
+        fig.for_each_annotation(lambda annotation: annotation.update(text=annotation.text.split("=", 1)[-1]))
+        return fig
+
+    display_figure((dataset.version, page, level, *names), build_comparison)
+
+    st.subheader("📋 Summary")
+    summary = rows[SUMMARY_COLUMNS].round(DISPLAY_DECIMALS)
+    summary.index = names
+    st.dataframe(summary)
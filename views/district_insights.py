@@ -0,0 +1,29 @@
+import streamlit as st
+
+from charts import display_chart
+
+
+# District-wise Insights Page
+def render(dataset, page, chart_type):
+    rollups = dataset.rollups
+
+    st.title("District-wise Insights")
+
+    # First, select Province with a unique key to avoid duplicate widget warnings
+    province = st.selectbox("🌍 Select Province", rollups.options(), key="district_insights_province")
+
+    # Divisions of the selected province
+    divisions = rollups.options(province)
+    division = st.selectbox("📍 Select Division", divisions, key="district_insights_division")  # ✅ Unique key
+
+    # Districts of the selected division
+    districts = rollups.options(province, division)
+    district = st.selectbox("🏙️ Select District", districts, key="district_insights_district")  # ✅ Unique key
+
+    # Pre-aggregated sub-divisions of the selected district
+    filtered_df = rollups.children("SUB DIVISION", province, division, district)
+
+    # Pass chart_type to display_chart function
+    display_chart(filtered_df, "SUB DIVISION", "TOTAL POPULATION", 
+                  f"Total Population in {district}, {division}, {province}", 
+                  "Sub Division", "Total Population", chart_type, key=(dataset.version, page, province, division, district))
@@ -0,0 +1,61 @@
+import streamlit as st
+import plotly.express as px
+
+from charts import display_chart, display_figure
+
+
+# Division-wise Gender Ratio Analysis Page
+def render(dataset, page, chart_type):
+    rollups = dataset.rollups
+
+    st.title("Division-wise Gender Ratio Analysis")
+
+    # Select Province with a unique key to avoid duplicate widget warnings
+    province = st.selectbox("🌍 Select Province", rollups.options(), key="gender_ratio_province")
+
+    # Select Division (filtered based on selected Province) with a unique key
+    division = st.selectbox("🏙️ Select Division", rollups.options(province), key="gender_ratio_division")
+
+    # Pre-aggregated districts of the selected division
+    division_df = rollups.children("DISTRICT", province, division)
+
+    # User selects Rural or Urban Population with a unique key
+    area_type = st.selectbox("🏡 Select Area Type", ["Rural", "Urban"], index=0, key="gender_ratio_area")
+
+    # User selects Gender Type with a unique key
+    gender_option = st.selectbox("🧑‍🤝‍🧑 Select Gender", ["Male", "Female", "Comparison"], index=0, key="gender_ratio_gender")
+
+    if gender_option == "Male":
+        gender_column = f"MALE ({area_type.upper()})"
+        display_chart(division_df, "DISTRICT", gender_column, f"{area_type} Male Population in {division}", "District", "Male Population", chart_type, key=(dataset.version, page, province, division))
+
+    elif gender_option == "Female":
+        gender_column = f"FEMALE ({area_type.upper()})"
+        display_chart(division_df, "DISTRICT", gender_column, f"{area_type} Female Population in {division}", "District", "Female Population", chart_type, key=(dataset.version, page, province, division))
+
+    else:  # Single Graph for Comparison
+        st.subheader(f"{area_type} Male vs Female Population in {division}")
+
+        def build_comparison():
+            # Create a new DataFrame for comparison
+            comparison_df = division_df[["DISTRICT", f"MALE ({area_type.upper()})", f"FEMALE ({area_type.upper()})"]]
+            comparison_df = comparison_df.melt(id_vars="DISTRICT", var_name="Gender", value_name="Population")
+
+            # Create a grouped bar chart with a new color combination
+            return px.bar(
+                comparison_df,
+                x="DISTRICT",
+                y="Population",
+                color="Gender",
+                title=f"{area_type} Male vs Female Population in {division}",
+                labels={"DISTRICT": "District", "Population": "Population"},
+                barmode="group",  # Ensures bars for Male & Female are side by side
+                color_discrete_map={
+                    "MALE (RURAL)": "#1f77b4",   # Deep Blue
+                    "FEMALE (RURAL)": "#ff7f0e", # Orange
+                    "MALE (URBAN)": "#2ca02c",   # Green
+                    "FEMALE (URBAN)": "#d62728"  # Red
+                }  # Custom color scheme
+            )
+
+        display_figure((dataset.version, page, province, division, area_type, "Comparison"), build_comparison)
@@ -0,0 +1,36 @@
+import streamlit as st
+
+from charts import display_chart
+
+
+# Division-wise Household Size Analysis Page
+def render(dataset, page, chart_type):
+    rollups = dataset.rollups
+
+    st.title("Division-wise Household Size Analysis")
+
+    # Select Province with a unique key to avoid duplicate widget warnings
+    province = st.selectbox("🌍 Select Province", rollups.options(), key="household_division_province")
+
+    # Select Division (filtered based on Province) with a unique key
+    division = st.selectbox("🏙️ Select Division", rollups.options(province), key="household_division_selection")
+
+    # Pre-aggregated districts of the selected division
+    division_df = rollups.children("DISTRICT", province, division)
+
+    # Check if filtered data is empty
+    if division_df.empty:
+        st.warning("No data available for the selected division.")
+    else:
+        # Create two columns to display graphs side by side
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("Rural Household Size")
+            display_chart(division_df, "DISTRICT", "AVG HOUSEHOLD SIZE (RURAL)", 
+                          f"Rural Household Size in {division}", "District", "Household Size", chart_type, key=(dataset.version, page, province, division))
+
+        with col2:
+            st.subheader("Urban Household Size")
+            display_chart(division_df, "DISTRICT", "AVG HOUSEHOLD SIZE (URBAN)", 
+                          f"Urban Household Size in {division}", "District", "Household Size", chart_type, key=(dataset.version, page, province, division))
@@ -0,0 +1,24 @@
+import streamlit as st
+
+from charts import display_chart
+
+
+# Division-wise Insights Page
+def render(dataset, page, chart_type):
+    rollups = dataset.rollups
+
+    st.title("Division-wise Insights")
+
+    # First, select Province with a unique key to avoid duplicate widget warnings
+    province = st.selectbox("🌍 Select Province", rollups.options(), key="province_1")
+
+    # Divisions of the selected province
+    divisions = rollups.options(province)
+    division = st.selectbox("📍 Select Division", divisions, key="division_insights")  # ✅ Unique key
+
+    # Pre-aggregated districts of the selected division
+    filtered_df = rollups.children("DISTRICT", province, division)
+
+    # Pass `chart_type` as an argument to display_chart()
+    display_chart(filtered_df, "DISTRICT", "TOTAL POPULATION", f"Total Population in {division}, {province}", 
+                  "District", "Total Population", chart_type, key=(dataset.version, page, province, division))
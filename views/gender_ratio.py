@@ -0,0 +1,48 @@
+import streamlit as st
+
+from charts import display_chart
+
+
+# Gender Ratio Analysis Page
+def render(dataset, page, chart_type):
+    rollups = dataset.rollups
+
+    st.title("Gender Ratio Analysis")
+
+    # Select Province with a unique key to avoid duplicate widget warnings
+    province = st.selectbox("🌍 Select Province", rollups.options(), key="gender_ratio_province")
+
+    # Pre-aggregated districts of the selected province
+    filtered_df = rollups.children("DISTRICT", province)
+
+    # User selects Rural or Urban Population with a unique key
+    area_type = st.selectbox("🏡 Select Area Type", ["Rural", "Urban"], index=0, key="gender_ratio_area")
+
+    # User selects Gender Type with a unique key
+    gender_option = st.selectbox("🧑‍🤝‍🧑 Select Gender", ["Male", "Female", "Comparison"], index=0, key="gender_ratio_gender")
+
+    # Set column names based on selection
+    if gender_option == "Male":
+        gender_column = f"MALE ({area_type.upper()})"
+        display_chart(filtered_df, "DISTRICT", gender_column, f"{area_type} Male Population in {province}",
+                      "District", "Population", chart_type, key=(dataset.version, page, province))
+    
+    elif gender_option == "Female":
+        gender_column = f"FEMALE ({area_type.upper()})"
+        display_chart(filtered_df, "DISTRICT", gender_column, f"{area_type} Female Population in {province}",
+                      "District", "Population", chart_type, key=(dataset.version, page, province))
+    
+    else:  # Comparison of Male and Female
+        st.subheader(f"{area_type} Male vs Female Population in {province}")
+        st.write("Comparison of Male and Female population side by side.")
+        
+        # Two charts: One for Male and one for Female
+        col1, col2 = st.columns(2)
+        with col1:
+            display_chart(filtered_df, "DISTRICT", f"MALE ({area_type.upper()})",
+                          f"{area_type} Male Population in {province}", "District", "Male Population", chart_type,
+                          key=(dataset.version, page, province))
+        with col2:
+            display_chart(filtered_df, "DISTRICT", f"FEMALE ({area_type.upper()})",
+                          f"{area_type} Female Population in {province}", "District", "Female Population", chart_type,
+                          key=(dataset.version, page, province))
@@ -0,0 +1,26 @@
+import streamlit as st
+
+from charts import display_chart
+
+
+# Growth Rate Analysis Page
+def render(dataset, page, chart_type):
+    rollups = dataset.rollups
+
+    st.title("Growth Rate Analysis")
+
+    # Select Province with a unique key to avoid duplicate widget warnings
+    province = st.selectbox("🌍 Select Province", rollups.options(), key="growth_rate_province")
+
+    # Pre-aggregated districts of the selected province
+    filtered_df = rollups.children("DISTRICT", province)
+
+    # User selects whether to view Rural or Urban Growth Rate
+    growth_type = st.radio("📈 Select Growth Rate Type", ["Rural", "Urban"], index=0)
+
+    # Set column name based on selection
+    growth_column = "ANNUAL GROWTH RATE (RURAL)" if growth_type == "Rural" else "ANNUAL GROWTH RATE (URBAN)"
+
+    # Display graph with corrected function call
+    display_chart(filtered_df, "DISTRICT", growth_column, 
+                  f"{growth_type} Annual Growth Rate in {province}", "District", "Growth Rate (%)", chart_type, key=(dataset.version, page, province))
@@ -0,0 +1,67 @@
+import streamlit as st
+import plotly.express as px
+
+from charts import display_figure
+
+
+# Home Page
+def render(dataset, page, chart_type):
+    rollups = dataset.rollups
+
+    st.title("📊 Welcome to the Pakistan Population Analysis")
+    
+    st.write("""
+    Explore the 2017 Pakistan Population Census data, covering provinces, divisions, districts, 
+    and sub-divisions. This dashboard provides insights into urban & rural populations, 
+    gender distribution, growth rates, and more.
+    """)
+
+    # Country-wide totals from the province rollup
+    totals = rollups.totals()
+    total_rural = totals["ALL SEXES (RURAL)"]
+    total_urban = totals["ALL SEXES (URBAN)"]
+    total_population = totals["TOTAL POPULATION"]
+
+    # Display total population statistics
+    st.markdown(f"""
+    ### 🏡 Total Rural Population: **{total_rural:,.0f}**  
+    ### 🏙️ Total Urban Population: **{total_urban:,.0f}**
+    ### 🌍 Total Population: **{total_population:,.0f}**
+    """)
+
+    # Add a new section for Province-wise Total Population Pie Chart
+    st.subheader("🌍 Province-wise Total Population Distribution")
+    province_population = rollups.table("PROVINCE")
+
+    display_figure((dataset.version, page, "TOTAL POPULATION"), lambda: px.pie(
+        province_population,
+        names="PROVINCE",
+        values="TOTAL POPULATION",
+        color_discrete_sequence=["green", "#4682B4", "#3CB371", "#FFA500", "#9370DB"],
+        title="Total Population by Province"
+    ))
+
+    # Create two columns to display pie charts
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("🌿 Rural Population Distribution")
+        rural_population = rollups.table("PROVINCE")
+        display_figure((dataset.version, page, "ALL SEXES (RURAL)"), lambda: px.pie(
+            rural_population, 
+            names="PROVINCE", 
+            values="ALL SEXES (RURAL)", 
+            color_discrete_sequence=["green", "#87CEFA", "#98FB98", "#FFDAB9", "#E6E6FA"],
+            title="Rural Population by Province"
+        ))
+
+    with col2:
+        st.subheader("🏢 Urban Population Distribution")
+        urban_population = rollups.table("PROVINCE")
+        display_figure((dataset.version, page, "ALL SEXES (URBAN)"), lambda: px.pie(
+            urban_population, 
+            names="PROVINCE", 
+            values="ALL SEXES (URBAN)", 
+            color_discrete_sequence=["green", "#87CEFA", "#98FB98", "#FFDAB9", "#E6E6FA"],
+            title="Urban Population by Province"
+        ))
@@ -0,0 +1,29 @@
+import streamlit as st
+
+from charts import display_chart
+
+
+# Household Size Analysis Page
+def render(dataset, page, chart_type):
+    rollups = dataset.rollups
+
+    st.title("Average Household Size Analysis")
+
+    # Select Province with a unique key to avoid duplicate widget warnings
+    province = st.selectbox("🌍 Select Province", rollups.options(), key="household_size_province")
+
+    # Pre-aggregated districts of the selected province
+    filtered_df = rollups.children("DISTRICT", province)
+
+    # Create two columns to display graphs side by side
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("Rural Household Size")
+        display_chart(filtered_df, "DISTRICT", "AVG HOUSEHOLD SIZE (RURAL)", 
+                      f"Rural Household Size in {province}", "District", "Household Size", chart_type, key=(dataset.version, page, province))
+
+    with col2:
+        st.subheader("Urban Household Size")
+        display_chart(filtered_df, "DISTRICT", "AVG HOUSEHOLD SIZE (URBAN)", 
+                      f"Urban Household Size in {province}", "District", "Household Size", chart_type, key=(dataset.version, page, province))
@@ -0,0 +1,25 @@
+import streamlit as st
+
+from charts import display_chart
+
+
+# Population Distribution Page
+def render(dataset, page, chart_type):
+    rollups = dataset.rollups
+
+    st.title("📈 Population Distribution")
+    
+    # Select Province with a unique key to avoid duplicate widget warnings
+    province = st.selectbox("🌍 Select Province", rollups.options(), key="population_distribution_province")
+
+    # Pre-aggregated districts of the selected province
+    filtered_df = rollups.children("DISTRICT", province)
+
+    # ✅ Update chart to show TOTAL POPULATION instead of only RURAL
+    display_chart(filtered_df, "DISTRICT", "TOTAL POPULATION", 
+                  f"Population Distribution in {province}", 
+                  "District", "Total Population", chart_type, key=(dataset.version, page, province))
+
+    # Calculate and display total population of the province
+    total_population = rollups.row(province)["TOTAL POPULATION"]
+    st.markdown(f"### 🌍 Total Population of {province}: **{total_population:,}**")
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from census import HIERARCHY
+from charts import DISPLAY_DECIMALS, display_figure
+from geo import boundary_path, load_boundaries
+
+# Levels that can be mapped, by radio label
+LEVELS = {"Provinces": "PROVINCE", "Divisions": "DIVISION", "Districts": "DISTRICT", "Sub-divisions": "SUB DIVISION"}
+
+# Metrics the map can be colored by
+METRICS = {
+    "Total population": "TOTAL POPULATION",
+    "Density (per sq.km)": "DENSITY (per sq.km)",
+    "Annual growth rate (%)": "ANNUAL GROWTH RATE (TOTAL)",
+    "Urban share (%)": "URBAN SHARE (%)",
+    "Sex ratio": "SEX RATIO (TOTAL)",
+    "Avg household size": "AVG HOUSEHOLD SIZE (TOTAL)",
+}
+
+
+# Population Map Page
+def render(dataset, page, chart_type):
+    rollups = dataset.rollups
+
+    st.title("Population Map")
+    st.write("Census metrics of every province, division, district or sub-division on the map.")
+
+    level = LEVELS[st.radio("🗂️ Level", list(LEVELS), index=0, horizontal=True, key="map_level")]
+    names = HIERARCHY[:HIERARCHY.index(level) + 1]
+    table = rollups.table(level)
+    boundaries = load_boundaries(level)
+    if boundaries is None:
+        # No map without the boundary file, but the numbers are still here
+        st.warning(f"⚠️ No boundaries for this level: add boundaries/{boundary_path(level).name} "
+                   "with a `name` property per feature to see the map.")
+        st.dataframe(table[names + list(METRICS.values())].round(DISPLAY_DECIMALS))
+        return
+
+    metric = st.selectbox("📊 Color by", list(METRICS), key="map_metric")
+    zoom = st.selectbox("🔍 Zoom to", ["Pakistan"] + rollups.options(), key="map_zoom")
+
+    def build_map():
+        # Features joined to their units, at the coarsest geometry that still
+        # looks exact at the zoomed extent
+        positions = boundaries.join(table, level)
+        features = np.flatnonzero(positions >= 0)
+        units = len(table)
+        if zoom != "Pakistan":
+            features = features[(table["PROVINCE"].to_numpy()[positions[features]] == zoom)]
+            # Out of the zoomed province's units, not the whole level's
+            start, stop = rollups.span(level, zoom)
+            units = stop - start
+        rows = table.iloc[positions[features]]
+        tolerance = boundaries.tolerance(features)
+        map_df = pd.DataFrame({
+            "id": [str(position) for position in positions[features]],
+            **{name.title(): rows[name].to_numpy() for name in names},
+            metric: rows[METRICS[metric]].astype("float64").round(DISPLAY_DECIMALS).to_numpy(),
+        })
+        fig = px.choropleth(map_df, geojson=boundaries.feature_collection(features, map_df["id"].tolist(), tolerance),
+                            locations="id", featureidkey="id", color=metric, hover_name=level.title(),
+                            hover_data={"id": False, **{name.title(): True for name in names[:-1]}},
+                            color_continuous_scale="Viridis", height=650,
+                            title=f"{metric} by {level.title()} ({len(features)} of {units} mapped)")
+        fig.update_geos(fitbounds="locations", visible=False)
+        fig.update_layout(margin={"l": 0, "r": 0, "t": 50, "b": 0})
+        return fig
+
+    display_figure((dataset.version, boundaries.signature, page, level, metric, zoom), build_map)
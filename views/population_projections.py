@@ -0,0 +1,49 @@
+import pandas as pd
+import streamlit as st
+import plotly.express as px
+
+from charts import display_figure, render_mode
+from projections import CENSUS_YEAR, load_projection
+
+
+# Population Projections Page
+def render(dataset, page, chart_type):
+    rollups = dataset.rollups
+
+    st.title("Population Projections")
+    st.write(f"Compound-growth projections from the {CENSUS_YEAR} census, using each area's 1998-2017 annual growth rate.")
+
+    # Provinces of the country, or districts of one province
+    province = st.selectbox("🌍 Select Province", ["All Provinces"] + rollups.options(), key="projection_province")
+    area_type = st.selectbox("🏡 Select Area Type", ["Total", "Rural", "Urban"], index=0, key="projection_area")
+    first_year, last_year = st.slider("📅 Projection Years", CENSUS_YEAR, 2100, (CENSUS_YEAR, 2050), key="projection_years")
+
+    if province == "All Provinces":
+        level, path, place = "PROVINCE", (), "Pakistan"
+    else:
+        level, path, place = "DISTRICT", (province,), province
+
+    # Every unit of the level is projected at once and cached; take this selection's rows
+    years, values = load_projection(dataset, level, first_year, last_year, area_type.upper())
+    start, stop = rollups.span(level, *path)
+    names = rollups.table(level)[level].iloc[start:stop].to_numpy()
+    projected = values[start:stop]
+
+    def build_projection():
+        # Whole people are enough for the chart
+        projection_df = pd.DataFrame(projected.round(), columns=years)
+        projection_df[level] = names
+        projection_df = projection_df.melt(id_vars=level, var_name="Year", value_name="Population")
+        return px.line(projection_df, x="Year", y="Population", color=level,
+                       title=f"Projected {area_type} Population in {place}",
+                       labels={level: level.title(), "Population": "Projected Population"},
+                       render_mode=render_mode(len(projection_df)))
+
+    display_figure((dataset.version, page, province, area_type, first_year, last_year), build_projection)
+
+    # Start and end of the projection for each unit
+    st.dataframe(pd.DataFrame({
+        level.title(): names,
+        str(first_year): projected[:, 0].round(),
+        str(last_year): projected[:, -1].round(),
+    }))
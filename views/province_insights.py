@@ -0,0 +1,20 @@
+import streamlit as st
+
+from charts import display_chart
+
+
+# Province-wise Insights Page
+def render(dataset, page, chart_type):
+    rollups = dataset.rollups
+
+    st.title("Province-wise Insights")
+
+    # Select Province with a unique key to avoid duplicate widget warnings
+    province = st.selectbox("🌍 Select Province", rollups.options(), key="province_insights")
+
+    # Pre-aggregated divisions of the selected province
+    filtered_df = rollups.children("DIVISION", province)
+
+    # Pass chart_type as an argument
+    display_chart(filtered_df, "DIVISION", "TOTAL POPULATION", f"Total Population in {province}", 
+                  "Division", "Total Population", chart_type, key=(dataset.version, page, province))
@@ -0,0 +1,24 @@
+import streamlit as st
+
+from charts import display_chart
+
+
+# Transgender Population Analysis Page
+def render(dataset, page, chart_type):
+    rollups = dataset.rollups
+
+    st.title("Transgender Population Analysis")
+
+    # Select Province with a unique key to avoid duplicate widget warnings
+    province = st.selectbox("🌍 Select Province", rollups.options(), key="transgender_province")
+
+    # Pre-aggregated districts of the selected province
+    filtered_df = rollups.children("DISTRICT", province)
+
+    # Display Transgender Population Chart (Rural)
+    display_chart(filtered_df, "DISTRICT", "TRANSGENDER (RURAL)", 
+                  f"Transgender Population in {province} (Rural)", "District", "Population", chart_type, key=(dataset.version, page, province))
+
+    # Display Transgender Population Chart (Urban)
+    display_chart(filtered_df, "DISTRICT", "TRANSGENDER (URBAN)", 
+                  f"Transgender Population in {province} (Urban)", "District", "Population", chart_type, key=(dataset.version, page, province))
@@ -0,0 +1,26 @@
+import streamlit as st
+
+from charts import display_chart
+
+
+# Urban vs Rural Comparison Page
+def render(dataset, page, chart_type):
+    rollups = dataset.rollups
+
+    st.title("Urban vs Rural Population Comparison")
+
+    # Select Province with a unique key to avoid duplicate widget warnings
+    province = st.selectbox("🌍 Select Province", rollups.options(), key="urban_rural_province")
+
+    # Pre-aggregated districts of the selected province
+    filtered_df = rollups.children("DISTRICT", province)
+
+    # Urban Population Graph (Top)
+    st.subheader("Urban Population")
+    display_chart(filtered_df, "DISTRICT", "ALL SEXES (URBAN)", 
+                  f"Urban Population in {province}", "District", "Population", chart_type, key=(dataset.version, page, province))
+
+    # Rural Population Graph (Below)
+    st.subheader("Rural Population")
+    display_chart(filtered_df, "DISTRICT", "ALL SEXES (RURAL)", 
+                  f"Rural Population in {province}", "District", "Population", chart_type, key=(dataset.version, page, province))